@@ -0,0 +1,104 @@
+import sys
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from maze import Maze
+
+def jobs(source, strategies):
+    """
+    Returns the (filename, strategy) jobs described by source. A directory gives every .txt file in it,
+    in name order, paired with each of the strategies. Any other file is read as a manifest with one
+    job per line, "filename strategy", where the strategy may be left out to use each of the strategies,
+    blank lines and lines starting with '#' are skipped, and relative filenames are taken relative to
+    the manifest.
+
+    :param source: Directory of mazes or manifest file
+    :type source: string
+    :param strategies: Strategies to use where a job names none
+    :type strategies: list(str, ...)
+    """
+    if os.path.isdir(source):
+        names = sorted(name for name in os.listdir(source) if name.endswith(".txt"))
+        return [(os.path.join(source, name), strategy) for name in names for strategy in strategies]
+    found = []
+    base = os.path.dirname(source)
+    with open(source) as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split()
+            filename = os.path.join(base, fields[0])
+            for strategy in fields[1:] or strategies:
+                found.append((filename, strategy))
+    return found
+
+def run(filename, strategy, paths=False):
+    """
+    Loads a maze and solves it with the named strategy, then returns a dict describing the result,
+    the seconds spent loading and searching, and the stats of the search. Errors are reported in the
+    dict instead of raised, so one bad job does not end the batch.
+
+    :param filename: Maze file
+    :type filename: string
+    :param strategy: Key of Maze.strategies
+    :type strategy: string
+    :param paths: Include the actions and states of the solution
+    :type paths: bool
+    """
+    result = {"file": filename, "strategy": strategy}
+    try:
+        if strategy not in Maze.strategies:
+            raise ValueError(f"strategy must be one of {', '.join(Maze.strategies)}")
+        begin = time.perf_counter()
+        maze = Maze(filename)
+        result["load"] = time.perf_counter() - begin
+        begin = time.perf_counter()
+        search = getattr(maze, Maze.strategies[strategy])
+        if strategy == "parallel":
+            """The batch already runs a process per core, so each job expands its layers in its own process"""
+            search(workers=1)
+        else:
+            search()
+        result["search"] = time.perf_counter() - begin
+        result["stats"] = maze.stats.as_dict()
+        if maze.solution is None:
+            result["steps"] = None
+        else:
+            actions, states = maze.solution
+            result["steps"] = len(actions)
+            if paths:
+                result["actions"] = actions
+                result["states"] = states
+    except Exception as error:
+        result["error"] = str(error)
+    return result
+
+def main():
+    """
+    batch.py solves many mazes at once, spreading the (file, strategy) jobs over a pool of worker
+    processes, and writes one JSON line per job to stdout as soon as the job finishes, so results stream
+    out in completion order rather than job order. Each line gives the file, strategy, steps in the
+    solution (null if there is none), the seconds spent loading and searching, and the stats of the
+    search.
+    """
+    parser = argparse.ArgumentParser(description="Solve a directory or manifest of mazes in parallel")
+    parser.add_argument("source", help="directory of .txt mazes, or manifest of 'filename [strategy]' lines")
+    parser.add_argument("--strategy", default="astar",
+                        help=f"comma separated strategies for jobs that name none: {', '.join(Maze.strategies)}")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, defaults to the number of cores")
+    parser.add_argument("--paths", action="store_true", help="include the actions and states of each solution")
+    args = parser.parse_args()
+
+    work = jobs(args.source, args.strategy.split(","))
+    begin = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(run, filename, strategy, args.paths) for filename, strategy in work]
+        for future in as_completed(futures):
+            print(json.dumps(future.result()), flush=True)
+    print(f"{len(work)} jobs in {time.perf_counter() - begin:.3f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from multiprocessing import Process, Queue
+from queue import Empty
+import numpy as np
+import maze as maze_module
+from maze import Maze
+from hierarchy import Abstraction
+from landmarks import Landmarks
+from portfolio import race
+
+"""Sizes of the mazes generated by default, from small to large and from two to four dimensions"""
+SIZES = "101x101,401x401,21x21x21,9x9x9x9"
+
+def landmark(maze):
+    """Solve with astar_search guided by the landmark heuristic"""
+    maze.astar_search(heuristic=Landmarks(maze).heuristic)
+    return maze.solution
+
+def portfolio(maze):
+    """Solve with the winner of a race between the strategies of portfolio.STRATEGIES"""
+    winner, solution, report = race(maze)
+    return solution
+
+def solver(method):
+    """Returns an engine running the named search method of Maze"""
+    def solve(maze):
+        getattr(maze, method)()
+        return maze.solution
+    return solve
+
+"""Every search engine benchmarked, by name, each taking a Maze and returning its solution"""
+ENGINES = {name: solver(method) for name, method in Maze.strategies.items()}
+ENGINES["hierarchical"] = lambda maze: Abstraction(maze).search()
+ENGINES["landmark"] = landmark
+ENGINES["portfolio"] = portfolio
+
+"""Engines whose solution depends on which process finishes first"""
+RACED = ("portfolio",)
+
+def generate(dims, seed=1, loops=0.05):
+    """
+    Returns the text of a random maze of the given dims, carved as a perfect maze by a depth-first walk
+    between the cells at even coordinates, then with a fraction loops of extra walls knocked out so that
+    there is more than one way through. The start is the first cell and the goal the last. Even sizes
+    are rounded up to odd ones so the maze ends on a cell.
+
+    :param dims: Size of each dimension
+    :type dims: tuple(int, ...)
+    :param seed: Seed of the random walk
+    :type seed: int
+    :param loops: Walls knocked out, as a fraction of the number of cells
+    :type loops: float
+    """
+    dims = tuple(n | 1 for n in dims)
+    rng = random.Random(seed)
+    grid = np.zeros(dims, dtype=bool)
+    start = (0,) * len(dims)
+    grid[start] = True
+    stack = [start]
+    while stack:
+        cell = stack[-1]
+        choices = []
+        for axis, n in enumerate(dims):
+            for step in (-2, 2):
+                position = cell[axis] + step
+                if 0 <= position < n:
+                    neighbour = cell[:axis] + (position,) + cell[axis + 1:]
+                    if not grid[neighbour]:
+                        choices.append((axis, step, neighbour))
+        if not choices:
+            stack.pop()
+            continue
+        axis, step, neighbour = rng.choice(choices)
+        grid[cell[:axis] + (cell[axis] + step // 2,) + cell[axis + 1:]] = True
+        grid[neighbour] = True
+        stack.append(neighbour)
+    """Knock out walls between two cells, found by moving a random cell one step along a random axis"""
+    cells = int(np.prod([n // 2 + 1 for n in dims]))
+    for i in range(int(cells * loops)):
+        cell = [2 * rng.randrange(n // 2 + 1) for n in dims]
+        axis = rng.randrange(len(dims))
+        if cell[axis] + 1 < dims[axis]:
+            cell[axis] += 1
+            grid[tuple(cell)] = True
+    chars = np.where(grid, Maze.space_char, Maze.wall_char)
+    chars[start] = Maze.start_char
+    chars[tuple(n - 1 for n in dims)] = Maze.goal_char
+
+    def text(block):
+        """Rows are joined by one sep_char, and blocks of k + 1 dimensions by k + 1 sep_chars"""
+        if block.ndim == 1:
+            return "".join(block)
+        return (Maze.sep_char * (block.ndim - 1)).join(text(sub) for sub in block)
+    return text(chars)
+
+def generated(sizes, directory, seed=1):
+    """
+    Returns the files of the generated mazes of the given sizes, writing any not already in the directory
+
+    :param sizes: Comma separated sizes, each dimension separated by 'x', e.g. "101x101,21x21x21"
+    :type sizes: string
+    :param directory: Directory holding the generated mazes
+    :type directory: string
+    :param seed: Seed of the generated mazes
+    :type seed: int
+    """
+    os.makedirs(directory, exist_ok=True)
+    files = []
+    for size in sizes.split(","):
+        dims = tuple(int(n) for n in size.split("x"))
+        filename = os.path.join(directory, f"generated-{size}-{seed}.txt")
+        if not os.path.exists(filename):
+            with open(filename, "w") as file:
+                file.write(generate(dims, seed))
+        files.append(filename)
+    return files
+
+def measure(filename, engine, encoded, repeat, seed, results):
+    """
+    Runs one engine on one maze inside a worker process and puts a dict describing the run on the results
+    queue: the best load and search seconds over repeat runs, the peak memory allocated by the search in a
+    further run traced by tracemalloc, which would slow the timed runs, the nodes expanded and the steps
+    in the solution. Memory allocated by other processes, as parallel and portfolio start, is not traced.
+    The random search is seeded here, since a worker started by spawn does not share the globals of its
+    parent.
+    """
+    result = {}
+    maze_module.SEED = seed
+    try:
+        load = search = np.inf
+        for i in range(repeat):
+            begin = time.perf_counter()
+            maze = Maze(filename, encoded)
+            middle = time.perf_counter()
+            solution = ENGINES[engine](maze)
+            end = time.perf_counter()
+            load = min(load, middle - begin)
+            search = min(search, end - middle)
+        traced = Maze(filename, encoded)
+        tracemalloc.start()
+        ENGINES[engine](traced)
+        result["memory"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        result["dims"] = list(maze.dims)
+        result["load"] = load
+        result["search"] = search
+        result["expanded"] = None if maze.stats is None else maze.stats.expanded
+        result["steps"] = None if solution is None else len(solution[0])
+    except Exception as error:
+        result["error"] = str(error)
+    results.put(result)
+
+def run(filename, engine, encoded=False, repeat=3, timeout=None, seed=1):
+    """
+    Benchmarks one engine on one maze in a fresh process, so that every run starts from the same state
+    and a run over the timeout can be stopped, and returns the dict put by measure, with an error if the
+    run failed or timed out
+
+    :param filename: Maze file
+    :type filename: string
+    :param engine: Key of ENGINES
+    :type engine: string
+    :param encoded: Search over flat integer cell indices instead of tuple states
+    :type encoded: bool
+    :param repeat: Timed runs, the best of which is kept
+    :type repeat: int
+    :param timeout: Seconds to wait for the runs
+    :type timeout: float
+    :param seed: Seed of the random search
+    :type seed: int
+    """
+    results = Queue()
+    worker = Process(target=measure, args=(filename, engine, encoded, repeat, seed, results))
+    worker.start()
+    try:
+        result = results.get(timeout=timeout)
+    except Empty:
+        worker.terminate()
+        result = {"error": f"timed out after {timeout}s"}
+    worker.join()
+    return result
+
+def compare(result, baseline, tolerance=0.2, floor=0.01, exact=True):
+    """
+    Returns the regressions of a result against its baseline, as a list of strings. A time or memory is
+    a regression if it grows by more than the tolerance, a fraction, and a time also only if it grows by
+    more than floor seconds, below which timings are noise. Nodes expanded are a regression if they grow
+    at all and steps if they change, since both are deterministic unless the engine is not exact. A run
+    that fails where the baseline did not is also a regression.
+
+    :param result: Result of run
+    :type result: dict
+    :param baseline: Result of run for the same maze and engine, saved before
+    :type baseline: dict
+    :param tolerance: Allowed relative growth of time and memory
+    :type tolerance: float
+    :param floor: Allowed absolute growth of time, in seconds
+    :type floor: float
+    :param exact: Whether the engine expands the same nodes and finds the same solution on every run
+    :type exact: bool
+    """
+    if "error" in result:
+        return [] if "error" in baseline else [f"error: {result['error']}"]
+    if "error" in baseline:
+        return []
+    found = []
+    for metric in ("load", "search", "memory"):
+        old = baseline.get(metric)
+        new = result[metric]
+        if old is None or new <= old * (1 + tolerance):
+            continue
+        if metric != "memory" and new - old <= floor:
+            continue
+        found.append(f"{metric} {new / old:.2f}x")
+    if not exact:
+        return found
+    old = baseline.get("expanded")
+    if old is not None and result["expanded"] is not None and result["expanded"] > old:
+        found.append(f"expanded {old} -> {result['expanded']}")
+    if baseline.get("steps") != result["steps"]:
+        found.append(f"steps {baseline.get('steps')} -> {result['steps']}")
+    return found
+
+def main():
+    """
+    benchmark.py runs every engine, each strategy of Maze.strategies and the engines of the other modules,
+    over the mazes of a directory and over generated mazes of increasing size and dimensionality, printing
+    one line per run as it finishes: the best load and search seconds, the peak memory of the search, the
+    nodes expanded and the steps in the solution. The random search is seeded so that it expands the same
+    nodes every time.
+
+    The results can be saved as JSON and compared against a saved baseline, every regression being
+    flagged on its line and the exit status being 1 if there is any.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the search engines over a corpus of mazes")
+    parser.add_argument("--mazes", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mazes"),
+                        help="directory of .txt mazes, defaults to the mazes of the repository")
+    parser.add_argument("--sizes", default=SIZES, help=f"comma separated sizes of generated mazes, '' for none, defaults to {SIZES}")
+    parser.add_argument("--generated", default=os.path.join(tempfile.gettempdir(), "maze-benchmark"),
+                        help="directory to keep the generated mazes in")
+    parser.add_argument("--engine", default=",".join(ENGINES), help=f"comma separated engines: {', '.join(ENGINES)}")
+    parser.add_argument("--encoded", action="store_true", help="search over flat integer cell indices")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs of each engine on each maze, the best kept")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed for the runs of each engine on each maze")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the generated mazes and the random search")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of results saved before to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative growth of time and memory")
+    parser.add_argument("--floor", type=float, default=0.01, help="allowed absolute growth of time, in seconds")
+    args = parser.parse_args()
+
+    engines = args.engine.split(",")
+    for engine in engines:
+        if engine not in ENGINES:
+            sys.exit(f"engine must be one of {', '.join(ENGINES)}")
+    files = sorted(os.path.join(args.mazes, name) for name in os.listdir(args.mazes) if name.endswith(".txt"))
+    if args.sizes:
+        files += generated(args.sizes, args.generated, args.seed)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    results = {}
+    regressions = 0
+    for filename in files:
+        for engine in engines:
+            key = f"{os.path.basename(filename)} {engine}" + (" encoded" if args.encoded else "")
+            result = run(filename, engine, args.encoded, args.repeat, args.timeout, args.seed)
+            results[key] = result
+            flags = compare(result, baseline[key], args.tolerance, args.floor, engine not in RACED) if key in baseline else []
+            regressions += bool(flags)
+            if "error" in result:
+                line = f"{key:40} {result['error']}"
+            else:
+                expanded = "-" if result["expanded"] is None else result["expanded"]
+                steps = "-" if result["steps"] is None else result["steps"]
+                line = (f"{key:40} load {result['load']:8.4f}s  search {result['search']:8.4f}s  "
+                        f"memory {result['memory'] / 2**20:8.2f}MiB  expanded {expanded:>8}  steps {steps:>6}")
+            if flags:
+                line += "  REGRESSION: " + ", ".join(flags)
+            print(line, flush=True)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=1)
+    if args.baseline:
+        print(f"{regressions} of {len(results)} runs regressed against {args.baseline}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
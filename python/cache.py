@@ -0,0 +1,217 @@
+"""Content-addressed on-disk cache of mazes, their derived structures and their solutions"""
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from maze import Maze
+
+"""Writes between scans of the cache directory for entries written by other processes"""
+RESCAN = 64
+
+class SolutionCache():
+    """
+    SolutionCache keeps, in one directory, everything worth reusing between runs on the same maze:
+        - <file digest>.maze, the maze file in the compiled format of Maze.compile, so a maze file read
+          before is opened without parsing
+        - <maze digest>.adjacency.npz, the arrays of Maze.adjacency
+        - <maze digest>.field-<digest>.npy, the Maze.distance_field of a source state
+        - <digest>.solution.json, the solution of one strategy between one start and goal
+
+    File digests are the SHA-256 of the bytes of a maze file. Maze digests are the SHA-256 of the dims
+    and the padded occupancy grid, so they identify the maze whatever file it was read from. Solutions
+    are keyed by the maze digest, the strategy, whether the maze is encoded, and the start and goal.
+
+    Entries are never invalidated, since a change to any part of a key gives a different digest.
+    Instead the directory is kept under a size cap by evicting the least recently used entries, every
+    read refreshing the modification time of the entry it reads. The total size is tracked as entries
+    are written, so the directory is only scanned once the total passes the cap, on the first write,
+    and every RESCAN writes to catch entries written by other processes. Entries are written to a temporary
+    file and renamed into place, so processes may share a directory.
+
+    :param directory: Directory holding the entries, defaults to $MAZE_CACHE or ~/.cache/maze
+    :type directory: string
+    :param limit: Largest total size of the entries, in bytes
+    :type limit: int
+    :param total: Total size of the entries as of the last scan and the writes since, None before any scan
+    :type total: int
+    """
+
+    def __init__(self, directory=None, limit=256 * 1024 * 1024):
+        if directory is None:
+            directory = os.environ.get("MAZE_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "maze"))
+        self.directory = directory
+        self.limit = limit
+        self.total = None
+        self.writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, name):
+        """
+        Returns the path of the named entry
+        """
+        return os.path.join(self.directory, name)
+
+    def touch(self, name):
+        """
+        Returns the path of the named entry if it exists, marking it as just used, else None
+        """
+        path = self.path(name)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def write(self, name, save):
+        """
+        Create the named entry by calling save with an open binary file, then evict old entries if the
+        cache has grown past its limit
+        """
+        path = self.path(name)
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                save(file)
+                size = file.tell()
+            try:
+                size -= os.stat(path).st_size
+            except FileNotFoundError:
+                pass
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self.writes += 1
+        if self.total is not None:
+            self.total += size
+        if self.total is None or self.total > self.limit or self.writes % RESCAN == 0:
+            self.trim()
+
+    def trim(self):
+        """
+        Delete the least recently used entries until the cache fits within its size limit, and record the
+        size left as the total
+        """
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        entries.sort()
+        for mtime, size, path in entries:
+            if total <= self.limit:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self.total = total
+
+    def clear(self):
+        """
+        Delete every entry
+        """
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                os.unlink(entry.path)
+        self.total = 0
+
+    def digest(self, maze):
+        """
+        Returns the digest identifying the occupancy of the maze, see Maze.digest
+        """
+        return maze.digest()
+
+    def load(self, filename, encoded=False):
+        """
+        Returns the Maze in the given file, opened from its compiled copy in the cache if the same file
+        contents have been loaded before, else parsed and compiled into the cache. The adjacency is also
+        restored from the cache if present.
+
+        :param filename: Maze file, as given to Maze
+        :type filename: string
+        :param encoded: Search over flat integer cell indices instead of tuple states
+        :type encoded: bool
+        """
+        sha = hashlib.sha256()
+        with open(filename, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                sha.update(block)
+        name = f"{sha.hexdigest()}.maze"
+        path = self.touch(name)
+        if path is None:
+            maze = Maze(filename, encoded)
+            self.write(name, maze.compile)
+        else:
+            maze = Maze(path, encoded)
+        self.adjacency(maze)
+        return maze
+
+    def adjacency(self, maze):
+        """
+        Returns Maze.adjacency of the maze, reading it from the cache into the maze if present, else
+        building it and storing it in the cache
+        """
+        if maze._adjacency is not None:
+            return maze._adjacency
+        name = f"{self.digest(maze)}.adjacency.npz"
+        path = self.touch(name)
+        if path is None:
+            arrays = [np.asarray(array) for array in maze.adjacency()]
+            self.write(name, lambda file: np.savez(file, indptr=arrays[0], neighbours=arrays[1], codes=arrays[2]))
+        else:
+            with np.load(path) as data:
+                maze._adjacency = tuple(memoryview(data[key]) for key in ("indptr", "neighbours", "codes"))
+        return maze._adjacency
+
+    def distance_field(self, maze, source=None):
+        """
+        Returns Maze.distance_field of the maze from the source state, defaulting to the goal state,
+        reading it from the cache if present, else computing it and storing it in the cache
+        """
+        source = tuple(maze.goal if source is None else source)
+        key = hashlib.sha256(repr(source).encode()).hexdigest()
+        name = f"{self.digest(maze)}.field-{key}.npy"
+        path = self.touch(name)
+        if path is not None:
+            return np.load(path)
+        field = maze.distance_field(source)
+        self.write(name, lambda file: np.save(file, field))
+        return field
+
+    def key(self, maze, strategy, start=None, goal=None):
+        """
+        Returns the name of the entry holding the solution of the strategy from start to goal, which
+        default to those of the maze
+        """
+        start = tuple(maze.start if start is None else start)
+        goal = tuple(maze.goal if goal is None else goal)
+        query = json.dumps([self.digest(maze), strategy, bool(maze.encoded), start, goal])
+        return f"{hashlib.sha256(query.encode()).hexdigest()}.solution.json"
+
+    def get(self, maze, strategy, start=None, goal=None):
+        """
+        Returns a tuple of whether a solution is cached and the solution: (found, solution). The solution
+        is a tuple of the action list and state list, (actions, states), or None if the search found no
+        solution.
+        """
+        path = self.touch(self.key(maze, strategy, start, goal))
+        if path is None:
+            return (False, None)
+        with open(path) as file:
+            solution = json.load(file)
+        if solution is None:
+            return (True, None)
+        actions, states = solution
+        return (True, ([tuple(action) for action in actions], [tuple(state) for state in states]))
+
+    def put(self, maze, strategy, solution, start=None, goal=None):
+        """
+        Store the solution of the strategy from start to goal, which default to those of the maze
+        """
+        text = json.dumps(solution).encode()
+        self.write(self.key(maze, strategy, start, goal), lambda file: file.write(text))
@@ -0,0 +1,22 @@
+import sys
+import time
+from maze import Maze
+
+def main():
+    """
+    compile.py reads a maze text file and writes it in the binary format of Maze.compile, which Maze
+    opens from a memory map with no parsing. Any filename given to Maze or main.py may be a compiled maze.
+    """
+    if len(sys.argv) != 3:
+        sys.exit("usage: python compile.py maze_file compiled_file")
+    begin = time.perf_counter()
+    maze = Maze(sys.argv[1])
+    parsed = time.perf_counter() - begin
+    maze.compile(sys.argv[2])
+    begin = time.perf_counter()
+    Maze(sys.argv[2])
+    print(f"dims : {maze.dims}")
+    print(f"parse: {parsed:.4f}s, compiled load: {time.perf_counter() - begin:.4f}s")
+
+if __name__ == "__main__":
+    main()
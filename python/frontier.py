@@ -1,5 +1,7 @@
 from node import Node
 import numpy as np
+import heapq
+from collections import deque
 
 """Stores nodes on the frontier of a search"""
 class Frontier():
@@ -9,13 +11,28 @@ class Frontier():
 
     :param frontier: List of nodes 
     :type frontier: list(node, ...)
+    :param pushed: Number of nodes added, the initial node included
+    :type pushed: int
+    :param duplicates: Number of nodes added for a state the frontier already held
+    :type duplicates: int
+    :param peak: Largest number of nodes held at once
+    :type peak: int
     """
 
     def __init__(self, initial_node=None):
-        if initial_node:
+        if initial_node is not None:
             self._frontier = [initial_node]
         else:
             self._frontier = []
+        self.reset_counters()
+
+    def reset_counters(self):
+        """
+        Start counting pushes and the peak size from the current contents
+        """
+        self.pushed = len(self._frontier)
+        self.duplicates = 0
+        self.peak = len(self._frontier)
 
     def __str__(self):
         s = ""
@@ -38,9 +55,10 @@ class Frontier():
         del self._frontier
 
     def initialize(self, initial_node):
-        if not initial_node:
+        if initial_node is None:
             raise ValueError("Missing initial node")
         self._frontier = [initial_node]
+        self.reset_counters()
 
     def length(self):
         """
@@ -71,7 +89,10 @@ class Frontier():
         """
         Append the node to the end of the list
         """
-        self.frontier.append(node)
+        self._frontier.append(node)
+        self.pushed += 1
+        if len(self._frontier) > self.peak:
+            self.peak = len(self._frontier)
 
     def greedy_index(self):
         """
@@ -97,4 +118,127 @@ class Frontier():
                 min_cost = cost
                 index = i
         return index
-            
+
+"""Stores nodes on the frontier of a breadth search"""
+class BreadthFrontier(Frontier):
+    """
+    The BreadthFrontier stores nodes in a double-ended queue so that nodes are removed in the order
+    they were added (FIFO) in O(1), instead of the O(n) list.pop(0) of Frontier.remove(0).
+
+    :param frontier: Queue of nodes
+    :type frontier: deque(node, ...)
+    """
+
+    def __init__(self, initial_node=None):
+        if initial_node is not None:
+            self._frontier = deque([initial_node])
+        else:
+            self._frontier = deque()
+        self.reset_counters()
+
+    def initialize(self, initial_node):
+        if initial_node is None:
+            raise ValueError("Missing initial node")
+        self._frontier = deque([initial_node])
+        self.reset_counters()
+
+    def remove(self):
+        """
+        Remove and return the oldest node in the frontier
+        """
+        try:
+            return self._frontier.popleft()
+        except IndexError:
+            raise ValueError("Unable to remove from frontier")
+
+"""Stores nodes on the frontier of a search ordered by priority"""
+class PriorityFrontier(Frontier):
+    """
+    The PriorityFrontier keeps the nodes of the frontier in a binary heap so that the node with the
+    lowest priority can be added or removed in O(log n) instead of scanning the whole list as
+    greedy_index and astar_index do. Ties are broken by insertion order, so the first node added is the
+    first node removed among nodes of equal priority.
+
+    Only the best entry for each state is kept alive. Adding a state again with a better priority
+    leaves the older entry in the heap as a stale entry, which is skipped (lazily deleted) once it
+    reaches the top of the heap.
+
+    :param priority: Function returning the priority of a node, lowest first. Defaults to node.cost
+    :type priority: function(Node) -> number
+    :param key: Function returning the state of a node. Defaults to node.state
+    :type key: function(Node) -> state
+    :param best: Best priority queued for each state still in the frontier
+    :type best: dict(state: number)
+    :param counter: Number of entries pushed, used to break ties
+    :type counter: int
+    """
+
+    def __init__(self, initial_node=None, priority=None, key=None):
+        if priority:
+            self._priority = priority
+        else:
+            self._priority = lambda node: node.cost
+        if key:
+            self._key = key
+        else:
+            self._key = lambda node: node.state
+        self._frontier = []
+        self._best = {}
+        self._counter = 0
+        self.reset_counters()
+        if initial_node is not None:
+            self.add(initial_node)
+
+    def __str__(self):
+        s = ""
+        for priority, count, node in sorted(self._frontier):
+            if self._best.get(self._key(node)) == priority:
+                s += f"{node}\n"
+        return s
+
+    def initialize(self, initial_node):
+        if initial_node is None:
+            raise ValueError("Missing initial node")
+        self._frontier = []
+        self._best = {}
+        self._counter = 0
+        self.reset_counters()
+        self.add(initial_node)
+
+    def length(self):
+        """
+        Returns the number of live (not stale) nodes in the frontier
+        """
+        return len(self._best)
+
+    def remove(self):
+        """
+        Remove and return the node with the lowest priority, skipping stale entries
+        """
+        while self._frontier:
+            priority, count, node = heapq.heappop(self._frontier)
+            """Only the entry matching the best queued priority of its state is alive"""
+            state = self._key(node)
+            if self._best.get(state) == priority:
+                del self._best[state]
+                return node
+        raise ValueError("Unable to remove from frontier")
+
+    def add(self, node):
+        """
+        Push the node onto the heap unless its state is already queued with an equal or better priority.
+        A push for a queued state counts as a duplicate, as it leaves a stale entry behind.
+        """
+        priority = self._priority(node)
+        state = self._key(node)
+        best = self._best.get(state)
+        if best is not None:
+            if best <= priority:
+                return
+            self.duplicates += 1
+        self._best[state] = priority
+        heapq.heappush(self._frontier, (priority, self._counter, node))
+        self._counter += 1
+        self.pushed += 1
+        if len(self._best) > self.peak:
+            self.peak = len(self._best)
@@ -0,0 +1,345 @@
+"""Hierarchical abstraction of a maze for path finding on very large mazes (HPA*)"""
+import numpy as np
+from frontier import PriorityFrontier
+
+class Abstraction():
+    """
+    The Abstraction splits the occupancy grid of a Maze into clusters, cubes with sides of 'size' cells,
+    and keeps a small abstract graph in place of the full maze. Its nodes are entrances: wherever a
+    connected stretch of open cells faces open cells across the border of two clusters, the middle pair
+    of that stretch becomes two nodes, one on each side, joined by a single step. Within each cluster,
+    every pair of entrances that can reach each other without leaving the cluster is joined by an edge
+    weighted by the steps between them.
+
+    A query connects the start and goal states to the entrances of their own clusters, runs an astar
+    search over the abstract graph, and only then refines the chosen edges into single actions, searching
+    the clusters the path passes through and no others. Paths are near-optimal rather than optimal,
+    since a path must cross each cluster border at one of its entrances.
+
+    The abstract graph is stored as flat arrays and can be written to and read from a file with save and
+    load, so it can be built once and shared across processes.
+
+    :param maze: Maze to abstract
+    :type maze: Maze
+    :param size: Length of the side of each cluster along every dimension
+    :type size: int
+    :param nodes: State of each entrance
+    :type nodes: list(tuple(int, ...), ...)
+    :param indptr: Start of the edges of each node, with one extra entry at the end
+    :type indptr: numpy.ndarray(int64)
+    :param targets: Node at the end of each edge
+    :type targets: numpy.ndarray(int64)
+    :param costs: Steps along each edge
+    :type costs: numpy.ndarray(int64)
+    """
+
+    def __init__(self, maze, size=10, build=True):
+        self.maze = maze
+        self.size = size
+        self.nodes = []
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.targets = np.zeros(0, dtype=np.int64)
+        self.costs = np.zeros(0, dtype=np.int64)
+        self.index = {}
+        self.clusters = {}
+        if build:
+            self.build()
+
+    def cluster(self, state):
+        """
+        Returns the index of the cluster holding the given state along each dimension
+        """
+        return tuple(s // self.size for s in state)
+
+    def local(self, cluster):
+        """
+        Returns the occupancy of a single cluster padded with a wall border, as bytes with 1 for walls,
+        along with the strides of the padded cluster and the state of its lowest corner
+
+        :param cluster: Index of the cluster along each dimension
+        :type cluster: tuple(int, ...)
+        """
+        lower = tuple(c * self.size for c in cluster)
+        """self.maze.maze is itself padded, hence the shift of one"""
+        block = self.maze.maze[tuple(slice(l + 1, min(l + self.size, n) + 1) for l, n in zip(lower, self.maze.dims))]
+        block = np.pad(block, 1, constant_values=True)
+        strides = tuple(stride // block.itemsize for stride in block.strides)
+        return block.tobytes(), strides, lower
+
+    def flood(self, walls, strides, root):
+        """
+        Conducts a breadth search from the root over the padded occupancy returned by local, then returns
+        every cell reached as a dict of cell: (parent cell, action, steps), cells being flat indices into
+        the padded cluster. The parent and action of the root are None.
+        """
+        moves = [(action, self.maze.moves[action] * strides[action[0]]) for action in self.maze.action_set]
+        reached = {root: (None, None, 0)}
+        layer = [root]
+        while layer:
+            grown = []
+            for cell in layer:
+                steps = reached[cell][2] + 1
+                for action, offset in moves:
+                    next = cell + offset
+                    if walls[next] or next in reached:
+                        continue
+                    reached[next] = (cell, action, steps)
+                    grown.append(next)
+            layer = grown
+        return reached
+
+    def explore(self, state):
+        """
+        Conducts a breadth search from the given state without leaving its cluster, then returns what it
+        reached as a dict of state: (parent state, action, steps). The parent and action of the given state
+        are None.
+
+        :param state: State from which to search
+        :type state: tuple(int, ...)
+        """
+        walls, strides, lower = self.local(self.cluster(state))
+
+        def decode(index):
+            state = []
+            for l, stride in zip(lower, strides):
+                s, index = divmod(index, stride)
+                state.append(s - 1 + l)
+            return tuple(state)
+
+        reached = self.flood(walls, strides, self.position(state, strides, lower))
+        states = {}
+        for cell, (parent, action, steps) in reached.items():
+            states[decode(cell)] = (None if parent is None else decode(parent), action, steps)
+        return states
+
+    def position(self, state, strides, lower):
+        """
+        Returns the flat index of the given state into the padded cluster returned by local
+        """
+        return sum((s - l + 1) * stride for s, l, stride in zip(state, lower, strides))
+
+    def entrances(self):
+        """
+        Returns the pairs of states (inside, outside) chosen as entrances between neighbouring clusters.
+        The open cell pairs facing each other across a cluster border are split into connected stretches
+        that stay within one pair of clusters, and the middle pair of each stretch is chosen.
+        """
+        passable = ~self.maze.maze
+        dims = self.maze.dims
+        pairs = []
+        for dim in range(self.maze.dimensions):
+            for border in range(self.size, dims[dim], self.size):
+                """Open cells on the last row of one cluster facing open cells on the first row of the next"""
+                face = np.take(passable, border, axis=dim) & np.take(passable, border + 1, axis=dim)
+                facing = set(map(tuple, np.argwhere(face) - 1))
+                others = [d for d in range(self.maze.dimensions) if d != dim]
+                while facing:
+                    seed = facing.pop()
+                    stretch = [seed]
+                    layer = [seed]
+                    while layer:
+                        grown = []
+                        for cell in layer:
+                            for i in range(len(others)):
+                                for step in (1, -1):
+                                    next = list(cell)
+                                    next[i] += step
+                                    next = tuple(next)
+                                    """Stretches may not cross into another cluster along the face"""
+                                    if next in facing and next[i] // self.size == cell[i] // self.size:
+                                        facing.discard(next)
+                                        stretch.append(next)
+                                        grown.append(next)
+                        layer = grown
+                    middle = sorted(stretch)[len(stretch) // 2]
+                    inside = list(middle)
+                    inside.insert(dim, border - 1)
+                    outside = list(middle)
+                    outside.insert(dim, border)
+                    pairs.append((tuple(inside), tuple(outside)))
+        return pairs
+
+    def build(self):
+        """
+        Construct the abstract graph: find the entrances, join each pair by a single step, then join every
+        two entrances of the same cluster by the steps between them inside the cluster.
+        """
+        index = {}
+        edges = []
+        self.nodes = []
+        for pair in self.entrances():
+            for state in pair:
+                if state not in index:
+                    index[state] = len(self.nodes)
+                    self.nodes.append(state)
+                    edges.append({})
+            inside, outside = index[pair[0]], index[pair[1]]
+            edges[inside][outside] = 1
+            edges[outside][inside] = 1
+        self.group()
+        for cluster, members in self.clusters.items():
+            walls, strides, lower = self.local(cluster)
+            cells = [self.position(self.nodes[node], strides, lower) for node in members]
+            for node, cell in zip(members, cells):
+                reached = self.flood(walls, strides, cell)
+                for other, target in zip(members, cells):
+                    if other != node and target in reached:
+                        edges[node][other] = reached[target][2]
+        self.pack(edges)
+
+    def group(self):
+        """
+        Index the nodes by state and by cluster
+        """
+        self.index = {state: node for node, state in enumerate(self.nodes)}
+        self.clusters = {}
+        for node, state in enumerate(self.nodes):
+            self.clusters.setdefault(self.cluster(state), []).append(node)
+
+    def pack(self, edges):
+        """
+        Store a list of dicts of node: steps, one per node, as the flat edge arrays
+        """
+        counts = [len(edge) for edge in edges]
+        self.indptr = np.zeros(len(edges) + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(counts)
+        self.targets = np.array([node for edge in edges for node in sorted(edge)], dtype=np.int64)
+        self.costs = np.array([edge[node] for edge in edges for node in sorted(edge)], dtype=np.int64)
+
+    def save(self, filename):
+        """
+        Write the abstract graph to the given file in NumPy .npz format, along with the digest of the maze
+        """
+        with open(filename, "wb") as file:
+            np.savez_compressed(file, size=self.size, digest=self.maze.digest(),
+                                nodes=np.array(self.nodes, dtype=np.int64).reshape(-1, self.maze.dimensions),
+                                indptr=self.indptr, targets=self.targets, costs=self.costs)
+
+    @classmethod
+    def load(cls, filename, maze):
+        """
+        Read an abstract graph written by save for the given maze, which must have the same occupancy as
+        the maze it was built for
+        """
+        with np.load(filename) as data:
+            abstraction = cls(maze, int(data["size"]), build=False)
+            if "digest" not in data or str(data["digest"]) != maze.digest():
+                raise ValueError("Abstraction does not match maze")
+            abstraction.nodes = [tuple(int(s) for s in node) for node in data["nodes"]]
+            abstraction.indptr = data["indptr"]
+            abstraction.targets = data["targets"]
+            abstraction.costs = data["costs"]
+        abstraction.group()
+        return abstraction
+
+    def search(self, start=None, goal=None):
+        """
+        Finds a path from start to goal over the abstract graph and refines it, then returns it as a
+        tuple of the action list and state list that reaches the goal state: (actions, states), or None
+        if the goal cannot be reached. Start and goal default to those of the maze.
+
+        :param start: State from which to search
+        :type start: tuple(int, ...)
+        :param goal: State to reach
+        :type goal: tuple(int, ...)
+        """
+        start = tuple(self.maze.start if start is None else start)
+        goal = tuple(self.maze.goal if goal is None else goal)
+        if start == goal:
+            return ([], [])
+        """Edges to and from start and goal, which only exist for this query"""
+        extra = {}
+        ends = []
+        for state in (start, goal):
+            if state in self.index:
+                ends.append(self.index[state])
+                continue
+            node = len(self.nodes) + len(ends)
+            ends.append(node)
+            reached = self.explore(state)
+            cluster = self.cluster(state)
+            for other, steps in self.members(cluster, reached):
+                extra.setdefault(node, []).append((other, steps))
+                extra.setdefault(other, []).append((node, steps))
+        states = {ends[0]: start, ends[1]: goal}
+        """Start and goal in the same cluster may also be joined directly"""
+        if self.cluster(start) == self.cluster(goal):
+            reached = self.explore(start)
+            if goal in reached:
+                extra.setdefault(ends[0], []).append((ends[1], reached[goal][2]))
+
+        def state(node):
+            return states[node] if node in states else self.nodes[node]
+
+        def distance(node):
+            return sum(abs(s - g) for s, g in zip(state(node), goal))
+
+        steps = {ends[0]: 0}
+        came = {ends[0]: None}
+        frontier = PriorityFrontier(ends[0], priority=lambda node: steps[node] + distance(node), key=lambda node: node)
+        explored = set()
+        while not frontier.empty():
+            current = frontier.remove()
+            if current == ends[1]:
+                break
+            explored.add(current)
+            edges = extra.get(current, [])
+            if current < len(self.nodes):
+                edges = edges + list(zip(self.targets[self.indptr[current]:self.indptr[current + 1]].tolist(),
+                                         self.costs[self.indptr[current]:self.indptr[current + 1]].tolist()))
+            for next, cost in edges:
+                if next in explored:
+                    continue
+                total = steps[current] + cost
+                if next not in steps or total < steps[next]:
+                    steps[next] = total
+                    came[next] = current
+                    frontier.add(next)
+        else:
+            return None
+
+        path = [ends[1]]
+        while came[path[-1]] is not None:
+            path.append(came[path[-1]])
+        path.reverse()
+        return self.refine([state(node) for node in path])
+
+    def members(self, cluster, reached):
+        """
+        Returns (node, steps) for every entrance of the cluster found in the states reached by explore
+        """
+        members = []
+        for node in self.clusters.get(cluster, []):
+            if self.nodes[node] in reached:
+                members.append((node, reached[self.nodes[node]][2]))
+        return members
+
+    def refine(self, waypoints):
+        """
+        Turns a list of states, each either one step from the next or in the same cluster, into a tuple of
+        the action list and state list passing through all of them: (actions, states)
+        """
+        actions = []
+        states = []
+        for source, target in zip(waypoints, waypoints[1:]):
+            if self.cluster(source) != self.cluster(target):
+                """Crossing a cluster border is a single step"""
+                for action in self.maze.action_set:
+                    next = list(source)
+                    next[action[0]] += self.maze.moves[action]
+                    if tuple(next) == target:
+                        break
+                actions.append(action)
+                states.append(target)
+                continue
+            reached = self.explore(source)
+            segment = []
+            state = target
+            while state != source:
+                parent, action, steps = reached[state]
+                segment.append((action, state))
+                state = parent
+            for action, state in reversed(segment):
+                actions.append(action)
+                states.append(state)
+        return (actions, states)
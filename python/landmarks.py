@@ -0,0 +1,81 @@
+"""Landmark (ALT) heuristics for searching a maze"""
+import numpy as np
+
+class Landmarks():
+    """
+    Landmarks stores the exact steps from a few chosen states, the landmarks, to every cell of a Maze,
+    and uses them to estimate the steps between any state and the goal. For a landmark L, the triangle
+    inequality gives
+        steps(state, goal) >= |steps(L, state) - steps(L, goal)|
+    so the largest such bound over all landmarks, or the manhatten distance if larger, never overestimates
+    and can be given to Maze.astar_search or Maze.greedy_search as their heuristic. In winding mazes it is
+    far closer to the true steps than the manhatten distance alone.
+
+    Landmarks are chosen by farthest point selection: the first is the state farthest from the start
+    state, and each following one is the state whose steps to the nearest landmark chosen so far is
+    largest. Steps are found with Maze.distance_field and stored as one int32 row per landmark, indexed by
+    the flat index of a cell into Maze.grid.
+
+    :param maze: Maze to estimate steps in
+    :type maze: Maze
+    :param landmarks: State of each landmark
+    :type landmarks: list(tuple(int, ...), ...)
+    :param distances: Steps from each landmark to each cell, -1 for walls and unreachable cells
+    :type distances: numpy.ndarray(int32) of shape (count, maze.grid.size)
+    """
+
+    def __init__(self, maze, count=4):
+        self.maze = maze
+        self.landmarks = []
+        rows = []
+        nearest = maze.distance_field(maze.start)
+        for i in range(count):
+            """The first landmark is the state farthest from the start state"""
+            far = np.unravel_index(np.argmax(nearest), nearest.shape)
+            source = tuple(int(s) for s in far)
+            field = maze.distance_field(source)
+            self.landmarks.append(source)
+            rows.append(np.pad(field, 1, constant_values=-1).reshape(-1))
+            if i == 0:
+                nearest = field
+            else:
+                """Cells the landmarks cannot reach stay at -1 and are never chosen"""
+                nearest = np.where((field >= 0) & (nearest >= 0), np.minimum(field, nearest), -1)
+        self.distances = np.stack(rows)
+        self._rows = [memoryview(row) for row in self.distances]
+        self.target(maze.goal)
+
+    def target(self, goal):
+        """
+        Set the goal state that heuristic estimates the steps to
+
+        :param goal: State to estimate the steps to
+        :type goal: tuple(int, ...)
+        """
+        cell = self.maze.index(goal)
+        self.goal = tuple(goal)
+        self._goal = [row[cell] for row in self._rows]
+
+    def heuristic(self, state):
+        """
+        Returns a lower bound on the steps from the given state to the targeted goal state, the largest of
+        the landmark bounds and the manhatten distance to it. Landmarks that cannot reach both the state and the
+        goal give no bound.
+
+        :param state: Representation of the current state, as used by the searches of the maze
+        :type state: tuple(int, ...), or int if the maze is encoded
+        """
+        cell = self.maze.cell(state)
+        """The manhatten distance to the targeted goal, which need not be the goal of the maze"""
+        position = self.maze.decode(state) if isinstance(state, int) else state
+        best = 0
+        for g, s in zip(self.goal, position):
+            best += abs(g - s)
+        for row, goal in zip(self._rows, self._goal):
+            steps = row[cell]
+            if steps < 0 or goal < 0:
+                continue
+            bound = abs(steps - goal)
+            if bound > best:
+                best = bound
+        return best
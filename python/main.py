@@ -1,5 +1,11 @@
 import sys
+import os
 from maze import Maze
+from hierarchy import Abstraction
+from landmarks import Landmarks
+from portfolio import race, STRATEGIES
+from cache import SolutionCache
+from replay import Replay
 import time
 
 def main():
@@ -7,7 +13,11 @@ def main():
     main.py reads in a maze file, searches for a solution per the specified search type, and prints out
     the answer if a solution can be found. big_factor is an integer multiple to increase the size of the
     maze, where 1 is normal, 2 is double, 3 is triple, etc. play determines whether to play back the solution
-    to the user (0 is no, 1 is yes), and delay is how many seconds between frames.
+    to the user (0 is no, 1 is yes, printing a frame per step, 2 is yes, redrawing a single frame in place
+    with ANSI cursor moves), and delay is how many seconds between frames.
+
+    Mazes and solutions are cached in $MAZE_CACHE, or ~/.cache/maze if it is unset. Setting MAZE_CACHE to
+    an empty string turns the cache off, and a cache that cannot be written to is skipped with a warning.
     """
     if len(sys.argv) != 6:
         sys.exit("usage: python main.py filename search_type big_factor play delay")
@@ -18,9 +28,22 @@ def main():
         play = int(sys.argv[4].lower())
         delay = float(sys.argv[5])
     except ValueError:
-        sys.exit("big_factor must be an integer\nplay must be a 0 or 1\ndelay must be a float")
+        sys.exit("big_factor must be an integer\nplay must be 0, 1, or 2\ndelay must be a float")
 
-    maze = Maze(filename)
+    """Mazes and solutions seen before are served from the cache; random search is never cached"""
+    cache = None
+    if os.environ.get("MAZE_CACHE") != "":
+        try:
+            cache = SolutionCache()
+            maze = cache.load(filename)
+        except OSError as error:
+            print(f"Cache disabled: {error}", file=sys.stderr)
+            cache = None
+    if cache is None:
+        maze = Maze(filename)
+    """Split the search time between expanding and the frontier in the stats printed below"""
+    maze.profile = True
+    cached = cache is not None and search_type in Maze.strategies and search_type != "random"
 
     print("Maze:\n")
     print(maze.print(big))
@@ -28,7 +51,12 @@ def main():
     print(f"start: {maze.start}")
     print(f"goal : {maze.goal}")
     print("Searching...")
-    if search_type == "breadth":
+    found = False
+    if cached:
+        found, maze.solution = cache.get(maze, search_type)
+    if found:
+        print("Solution found in cache")
+    elif search_type == "breadth":
         maze.breadth_search()
     elif search_type == "depth":
         maze.depth_search()
@@ -38,9 +66,40 @@ def main():
         maze.astar_search()
     elif search_type == "random":
         maze.random_search()
+    elif search_type == "bidirectional":
+        maze.bidirectional_search()
+    elif search_type == "jump":
+        maze.jump_point_search()
+    elif search_type == "idastar":
+        maze.ida_star_search()
+        for threshold, nodes in maze.iterations:
+            print(f"threshold {threshold}: {nodes} nodes")
+    elif search_type == "parallel":
+        maze.parallel_search()
+    elif search_type == "portfolio":
+        winner, maze.solution, report = race(maze)
+        print(f"winner: {winner}")
+        for strategy in STRATEGIES:
+            result = report[strategy]
+            status = "finished" if result["finished"] else "cancelled"
+            print(f"{strategy}: {status} after {result['seconds']:.4f}s")
+    elif search_type == "hierarchical":
+        maze.solution = Abstraction(maze).search()
+    elif search_type == "landmark":
+        maze.astar_search()
+        plain = maze.expanded
+        landmarks = Landmarks(maze)
+        maze.astar_search(heuristic=landmarks.heuristic)
+        print(f"landmarks: {landmarks.landmarks}")
+        print(f"expanded: {plain} without landmarks, {maze.expanded} with landmarks")
     else:
-        sys.exit("search_type must be breadth, depth, greedy, astar, or random")
+        sys.exit("search_type must be breadth, depth, greedy, astar, random, bidirectional, jump, idastar, parallel, portfolio, hierarchical, or landmark")
+    if cached and not found:
+        cache.put(maze, search_type, maze.solution)
         
+    if not found and maze.stats is not None:
+        print("Stats:")
+        print(maze.stats)
     print("Solution is:")
     actions, cells = maze.solution
     print(f"Actions: {actions}")
@@ -49,10 +108,17 @@ def main():
 
     if play:
         print("Replaying solution:")
+        """Only the cells of the previous and current states are redrawn at each step"""
+        replay = Replay(maze, big)
+        if play == 2:
+            print(replay.base, end="")
         for state in cells:
             time.sleep(delay)
-            print("-" * 20)
-            print(maze.print_state(state, big))
+            if play == 2:
+                print(replay.step_ansi(state), end="", flush=True)
+            else:
+                print("-" * 20)
+                print(replay.step(state))
         print("Finished.")
 
     
@@ -1,13 +1,22 @@
 import sys
 import re
-from node import Node
-from frontier import Frontier
-from dimensions import Dimensions
+import copy
+from node import Node, NodePool
+from frontier import Frontier, BreadthFrontier, PriorityFrontier
+from parallel import level_search
+from stats import measured
 import random
+import time
+import hashlib
+from array import array
+import numpy as np
 
 """SEED the random search function"""
 SEED=None
 
+"""First bytes of a maze file written by Maze.compile"""
+MAGIC = b"MAZEBIN1"
+
 class Maze:
     """
     Initializes an instance of Maze
@@ -26,6 +35,12 @@ class Maze:
     :type sep_char: char/str
     :param actions: List of actions that can be taken in a single dimension
     :type actions: list(str, str)
+    :param strategies: Search method used by solve for each strategy name
+    :type strategies: dict(str: str)
+    :param profile: Time expanding and frontier operations separately in stats, slowing the searches
+    :type profile: bool
+    :param stats: Counters and timings of the last search, a new Stats for every search
+    :type stats: Stats
     """
 
     start_char = 'A'
@@ -35,28 +50,92 @@ class Maze:
     wall_char = '#'
     sep_char = '\n'
     actions = ["up", "down"]
+    profile = False
+    strategies = {
+        "breadth": "breadth_search",
+        "depth": "depth_search",
+        "greedy": "greedy_search",
+        "astar": "astar_search",
+        "random": "random_search",
+        "bidirectional": "bidirectional_search",
+        "jump": "jump_point_search",
+        "idastar": "ida_star_search",
+        "parallel": "parallel_search",
+    }
     
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, encoded=False):
         """
         Initializes a Maze instance using built in functionality.
+
+        :param encoded: Search over flat integer cell indices instead of tuple states
+        :type encoded: bool
         """
+        self.encoded = encoded
+        self.timings = {}
+        self.stats = None
         if filename:
-            self.load(filename)
-            self.set_dim()
+            with open(filename, "rb") as file:
+                compiled = file.read(len(MAGIC)) == MAGIC
+            if compiled:
+                self.load_compiled(filename)
+                return
+            begin = time.perf_counter()
+            self.parse(filename)
+            self.timings["load"] = time.perf_counter() - begin
+            begin = time.perf_counter()
             self.set_actions()
-            self.build()
+            self.layout()
+            self.timings["build"] = time.perf_counter() - begin
         else:
             self.dims = []
             self.dimensions = 0
 
+    @property
+    def expanded(self):
+        """
+        Returns the number of states expanded by the last search, as recorded in self.stats
+        """
+        if self.stats is None:
+            return None
+        return self.stats.expanded
+
     def __str__(self):
         """
-        Returns the contents loaded from file
+        Returns the contents loaded from file, or for a compiled maze its printed representation
         """
+        if getattr(self, "contents", "") is None:
+            return self.print()
         if not self.contents:
             raise Exception("Maze not yet loaded")
         return self.contents
 
+    def __copy__(self):
+        """
+        Returns a shallow copy sharing every attribute, the adjacency included, unlike a pickled copy
+        """
+        maze = self.__class__.__new__(self.__class__)
+        maze.__dict__.update(self.__dict__)
+        return maze
+
+    def __getstate__(self):
+        """
+        Returns the attributes to pickle, as when a maze is sent to another process. The adjacency, held
+        in memoryviews, and the memory-mapped file of a compiled maze cannot be pickled, and the flat
+        view self.grid would be pickled as a copy of self.maze, so all three are left out.
+        """
+        state = self.__dict__.copy()
+        for name in ("_adjacency", "packed", "grid"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restore the pickled attributes and derive self.grid again; the adjacency is rebuilt when needed
+        """
+        self.__dict__.update(state)
+        if "maze" in state:
+            self.layout()
+
     def print(self, big=1):
         """
         Returns a string representing the maze that can be printed to screen. The string uses the class
@@ -65,50 +144,10 @@ class Maze:
         of length big, e.g., for big=1 the maze is normal, for big=2 the maze is twice as tall and twice
         as wide, etc.
 
-        :param counter: Tracks current state in maze
-        :type counter: Dimensions class
-        :param s: Representation of maze to be returned
-        :type s: string
         :param big: Big factor used to determine maze magnification
         :type big: int
         """
-        
-        s = ""
-        counter = Dimensions()
-        counter.set_dimensions(self.dims)
-        row = ""
-        """Loop over all possible states using counter until counter rolls over to all zeros"""
-        while True:
-            current = tuple(counter.count)
-            """State checking to ensure each state is properly represeted using the cls variable chars"""
-            if current == self.start:
-                row += self.start_char * big
-            elif current == self.goal:
-                row += self.goal_char * big
-            elif self.value(self.maze, current):
-                row += self.wall_char * big
-            else:
-                row += self.space_char * big
-
-            counter.increment()
-            next = tuple(counter.count)
-            """Tracks correct dimensional representation in s by inserting 'sep_char's"""
-            if counter.count[self.dimensions - 1] == 0:
-                row += self.sep_char
-                s += row * big
-                row = ""
-                """Check for higher dimensional shifts and insert the appropriate nunber of sep_char"""
-                diff = list()
-                for c, n in zip(current, next):
-                    diff.append(n - c)
-                for i in range(self.dimensions):
-                    if diff[i] == 1:
-                        s += self.sep_char * (self.dimensions - 2 - i)
-                        break
-            """Once counter reads all zeros, every state has been included in the representation"""
-            if all(n == 0 for n in next):
-                break
-        return s
+        return self.render(None, big)
 
     def print_state(self, state, big=1):
         """
@@ -118,40 +157,7 @@ class Maze:
         :param state: Current state to be represented
         :param type: tuple(int, ...)
         """
-        s = ""
-        counter = Dimensions()
-        counter.set_dimensions(self.dims)
-        row = ""
-        while True:
-            current = tuple(counter.count)
-            """As print, but also check whether the counter state is the state to be included in the representation"""
-            if current == self.start:
-                row += self.start_char * big
-            elif current == self.goal:
-                row += self.goal_char * big
-            elif current == state:
-                row += self.state_char * big
-            elif self.value(self.maze, counter.count):
-                row += self.wall_char * big
-            else:
-                row += self.space_char * big
-
-            counter.increment()
-            next = tuple(counter.count)
-            if counter.count[self.dimensions - 1] == 0:
-                row += self.sep_char
-                s += row * big
-                row = ""
-                diff = list()
-                for c, n in zip(current, next):
-                    diff.append(n - c)
-                for i in range(self.dimensions):
-                    if diff[i] == 1:
-                        s += self.sep_char * (self.dimensions - 2 - i)
-                        break
-            if all(n == 0 for n in next):
-                break
-        return s
+        return self.render(state, big)
 
     def load(self, filename):
         """
@@ -176,6 +182,159 @@ class Maze:
             raise Exception("Maze does not have one goal")
         self.contents = contents.strip('\n')
 
+    def render(self, state=None, big=1):
+        """
+        Builds the strings returned by print and print_state with NumPy instead of a loop over the cells.
+        The occupancy is mapped to an array of character codes, the start, goal and given state are
+        written over it, and the big factor is applied with np.repeat along the last dimension and then
+        to whole rows. Every row ends with a sep_char, and a row closing a block along k dimensions, i.e.
+        whose trailing k indices are at their largest, is followed by k more sep_chars, except the very
+        last row. Those extra sep_chars are laid out in spare columns after each row, the unused ones
+        holding a filler that is dropped before the codes are decoded in a single step.
+
+        :param state: Current state to be represented, if any
+        :type state: tuple(int, ...)
+        :param big: Big factor used to determine maze magnification
+        :type big: int
+        """
+        if not self.dims:
+            return ""
+        interior = self.maze[(slice(1, -1),) * self.dimensions]
+        codes = np.where(interior, ord(self.wall_char), ord(self.space_char)).astype(np.uint32)
+        """Later writes win, so the state is written first as the loop in print_state checks it last"""
+        if state is not None:
+            codes[tuple(state)] = ord(self.state_char)
+        codes[self.goal] = ord(self.goal_char)
+        codes[self.start] = ord(self.start_char)
+        width = self.dims[-1] * big
+        rows = codes.reshape(-1, self.dims[-1])
+        count = rows.shape[0]
+        """Extra sep_chars after each row: the number of trailing row indices at their largest"""
+        shape = self.dims[:-1]
+        extra = np.zeros(count, dtype=np.int64)
+        if shape:
+            at = np.ones(count, dtype=bool)
+            index = np.indices(shape).reshape(len(shape), -1)
+            for dim in range(len(shape) - 1, -1, -1):
+                at &= index[dim] == shape[dim] - 1
+                extra += at
+            """The row after which the counter rolls over gets none"""
+            extra[-1] = 0
+        spare = max(self.dimensions - 2, 0)
+        filler = np.uint32(0xFFFFFFFF)
+        lines = np.empty((count, big, width + 1), dtype=np.uint32)
+        lines[:, :, :width] = np.repeat(rows, big, axis=1)[:, None, :]
+        lines[:, :, width] = ord(self.sep_char)
+        out = np.full((count, big * (width + 1) + spare), filler, dtype=np.uint32)
+        out[:, :big * (width + 1)] = lines.reshape(count, -1)
+        if spare:
+            out[:, big * (width + 1):][np.arange(spare)[None, :] < extra[:, None]] = ord(self.sep_char)
+        out = out.reshape(-1)
+        return out[out != filler].astype("<u4").tobytes().decode("utf-32-le")
+
+    def parse(self, filename, chunk=1 << 20):
+        """
+        Reads a maze file in a single pass, a chunk of characters at a time, and fills the occupancy grid
+        and the start and goal states as it goes, in place of load, set_dim and build. The result is the
+        same as theirs, except that the text is not kept: self.contents is None.
+
+        Rows are the characters between runs of sep_char. A run of k sep_chars moves a mixed-radix cursor
+        along as Dimensions.increment does, but k places up: the cursor counts one more at place k and
+        restarts every lower place at zero, just as det_dim and assemble move to the next sub-maze after k
+        sep_chars. Since the number of dimensions is only known once the longest run has been seen, places
+        are counted from the row upward and each finished row is kept as its wall mask along with the
+        cursor, until the grid is allocated at the end. Leading and trailing sep_chars are ignored, as
+        load strips them.
+
+        :param filename: Name of the file to be read
+        :type filename: string
+        :param chunk: Number of characters read at a time
+        :type chunk: int
+        """
+        separator = re.compile(f"({re.escape(self.sep_char)}+)")
+        cursor = [0]
+        extents = [0]
+        rows = []
+        pending = []
+        row = []
+        run = 0
+        starts = []
+        goals = []
+        ignored = np.array([ord(self.space_char), ord(self.start_char), ord(self.goal_char)], dtype=np.uint32)
+
+        def finish():
+            """Queue the current row at the cursor and note any start or goal in it"""
+            text = "".join(row)
+            row.clear()
+            place = tuple(cursor[1:])
+            for char, found in ((self.start_char, starts), (self.goal_char, goals)):
+                i = text.find(char)
+                while i != -1:
+                    found.append((i,) + place)
+                    i = text.find(char, i + 1)
+            pending.append((place, text))
+            if len(text) > extents[0]:
+                extents[0] = len(text)
+
+        def convert():
+            """Turn the queued rows into wall masks all at once"""
+            if not pending:
+                return
+            codes = np.frombuffer("".join(text for place, text in pending).encode("utf-32-le"), dtype=np.uint32)
+            walls = ~np.isin(codes, ignored)
+            bounds = np.cumsum([len(text) for place, text in pending])[:-1]
+            for (place, text), mask in zip(pending, np.split(walls, bounds)):
+                rows.append((place, mask))
+            pending.clear()
+
+        with open(filename) as file:
+            while True:
+                text = file.read(chunk)
+                if not text:
+                    break
+                for piece in separator.split(text):
+                    if not piece:
+                        continue
+                    if piece.startswith(self.sep_char):
+                        """A run ends the row before it, and may continue into the next chunk"""
+                        if row:
+                            finish()
+                        run += len(piece) // len(self.sep_char)
+                        continue
+                    if run and (rows or pending):
+                        """Count one more at place run, restarting the lower places"""
+                        while len(cursor) <= run:
+                            cursor.append(0)
+                            extents.append(1)
+                        cursor[run] += 1
+                        for k in range(1, run):
+                            cursor[k] = 0
+                        extents[run] = max(extents[run], cursor[run] + 1)
+                    run = 0
+                    row.append(piece)
+                convert()
+        if row:
+            finish()
+        convert()
+        if len(starts) != 1:
+            raise Exception("Maze does not have one start")
+        if len(goals) != 1:
+            raise Exception("Maze does not have one goal")
+
+        self.contents = None
+        self.dimensions = len(cursor)
+        self.dims = list(reversed(extents))
+        self.maze = np.ones([n + 2 for n in self.dims], dtype=bool)
+
+        def position(place, n):
+            """Turn n places counted upward into a state, places the cursor never reached being zero"""
+            return tuple(reversed(place + (0,) * (n - len(place))))
+
+        for place, walls in rows:
+            self.maze[tuple(i + 1 for i in position(place, self.dimensions - 1))][1:len(walls) + 1] = walls
+        self.start = position(starts[0], self.dimensions)
+        self.goal = position(goals[0], self.dimensions)
+
     def det_dim(self, contents, index=0):
         """
         det_dim is called by set_dim to determine the maximum length of each dimension. det_dim works
@@ -235,19 +394,19 @@ class Maze:
                 self.dims = [0] * self.dimensions
                 self.det_dim(self.contents)
                 
-    def assemble(self, contents, index=0):
+    def assemble(self, contents, index=0, position=()):
         """
-        assemble is called by build to construct a boolean representation of the maze and functions
-        recursively
+        assemble is called by build to fill the boolean representation of the maze and functions
+        recursively. Every sub-maze is written into self.maze at its offset, shifted by one along each
+        dimension to leave room for the wall border.
 
         :param contents: Representation of the maze to be parsed
         :type contents: string
         :param index: current level of recursion
         :type index: int
-        :param maze: boolean representation of the maze
-        :type maze: nested lists of booleans
+        :param position: Index of the current sub-maze along each of the preceding dimensions
+        :type position: tuple(int, ...)
         """
-        maze = []
         dims = self.dimensions - 1 - index
         """If not yet at the deepest level, recur"""
         if dims > 0:
@@ -261,25 +420,27 @@ class Maze:
                 if self.goal_char in piece:
                     """Set the index of the goal state along current dimension"""
                     self.goal[index] = i
-                """Parse and append the subsegment of the maze"""
-                maze.append(self.assemble(piece, index + 1))
+                """Parse and store the subsegment of the maze"""
+                self.assemble(piece, index + 1, position + (i,))
         else:
             """If at deepest level, parse the subsegment of maze based on each character"""
+            row = []
             for i, char in enumerate(contents):
                 if char == self.start_char:
                     """Set the index of the start state along final dimension"""
                     self.start[index] = i
-                    maze.append(False)
+                    row.append(False)
                 elif char == self.goal_char:
                     """Set the index of the goal state along final dimension"""
                     self.goal[index] = i
-                    maze.append(False)
+                    row.append(False)
                 elif char == self.space_char:
-                    maze.append(False)
+                    row.append(False)
                 else:
                     """Any character that is not explicitly the start_char, goal_char, or space_char is interpreted as a wall_char"""
-                    maze.append(True)
-        return maze
+                    row.append(True)
+            """Cells past the end of a short row keep the wall value they were initialized with"""
+            self.maze[tuple(i + 1 for i in position)][1:len(row) + 1] = row
 
     def build(self):
         """
@@ -288,70 +449,292 @@ class Maze:
         Call assemble to construct the maze and determine the start and goal states.
         Convert state and goal to tuples.
 
+        The maze is a single contiguous array padded with a border of walls one cell thick, so a
+        state one step outside the maze along any dimension still reads as a wall. Cells are read
+        through their flat index into self.grid, using the precomputed strides of each dimension.
+
         :param self.start: Start state
         :type self.start: tuple
         :param self.goal: Goal state
         :type self.goal: tuple
-        :param self.maze: Representation of the maze
-        :type self.maze: nested lists of booleans
+        :param self.maze: Representation of the maze, True for walls, with a wall border
+        :type self.maze: numpy.ndarray(bool) of shape dims + 2
+        :param self.grid: Flat view of self.maze
+        :type self.grid: numpy.ndarray(bool)
+        :param self.strides: Flat index offset of one step along each dimension
+        :type self.strides: tuple(int, ...)
+        :param self.offsets: Flat index offset of each action in the action set
+        :type self.offsets: dict(tuple(int, string): int)
         """
         self.start = [0] * self.dimensions
         self.goal = [0] * self.dimensions
-        self.maze = self.assemble(self.contents)
+        self.maze = np.ones([n + 2 for n in self.dims], dtype=bool)
+        self.assemble(self.contents)
         self.start = tuple(self.start)
         self.goal = tuple(self.goal)
+        self.layout()
+
+    def layout(self):
+        """
+        Derive the flat view of self.maze, the strides of each dimension and the offset of each action,
+        as described in build, and drop any adjacency and digest computed for an earlier maze.
+        """
+        self.grid = self.maze.reshape(-1)
+        self.strides = tuple(stride // self.maze.itemsize for stride in self.maze.strides)
+        self.offsets = {}
+        for (dim, action), step in self.moves.items():
+            self.offsets[(dim, action)] = step * self.strides[dim]
+        self._adjacency = None
+        self._digest = None
+
+    def digest(self):
+        """
+        Returns the SHA-256 of the dims and the padded occupancy grid as hex, identifying the maze whatever
+        file it was read from, as used by SolutionCache and Abstraction.save. It is computed once and kept,
+        so the grid must not be changed afterwards without calling layout again.
+        """
+        if getattr(self, "_digest", None) is None:
+            sha = hashlib.sha256(np.array(self.dims, dtype="<i8").tobytes())
+            sha.update(self.grid.tobytes())
+            self._digest = sha.hexdigest()
+        return self._digest
+
+    def compile(self, filename):
+        """
+        Write the maze to the given file in a compact binary format that load_compiled reads without any
+        parsing. The file holds, in order:
+            - MAGIC, 8 bytes
+            - the number of dimensions n, then dims, start and goal, n values each, all little-endian int64
+            - the padded occupancy self.grid, one bit per cell with the first cell in the lowest bit
+
+        :param filename: Name of the file to write, or a binary file open for writing
+        :type filename: string or file
+        """
+        header = np.array([self.dimensions, *self.dims, *self.start, *self.goal], dtype="<i8")
+        """An open binary file may be given in place of a name, and is left open for the caller"""
+        if not hasattr(filename, "write"):
+            with open(filename, "wb") as file:
+                self.compile(file)
+            return
+        filename.write(MAGIC)
+        filename.write(header.tobytes())
+        filename.write(np.packbits(self.grid, bitorder="little").tobytes())
+
+    def load_compiled(self, filename):
+        """
+        Open a maze written by compile. The file is memory-mapped, so its pages are read on demand and
+        shared through the page cache by every process opening it, and the header is read straight from
+        the mapping; the only work done is unpacking the occupancy bits into self.maze. The raw mapping
+        is kept as self.packed. A compiled maze has no text contents.
+
+        :param filename: Name of the file to be read
+        :type filename: string
+        :param self.packed: Bit-packed padded occupancy, as stored in the file
+        :type self.packed: numpy.memmap(uint8)
+        """
+        started = time.perf_counter()
+        data = np.memmap(filename, dtype=np.uint8, mode="r")
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            raise Exception("File is not a compiled maze")
+        begin = len(MAGIC)
+        self.dimensions = int(data[begin:begin + 8].view("<i8")[0])
+        end = begin + 8 * (1 + 3 * self.dimensions)
+        header = data[begin + 8:end].view("<i8").tolist()
+        n = self.dimensions
+        self.dims = header[:n]
+        self.start = tuple(header[n:2 * n])
+        self.goal = tuple(header[2 * n:])
+        self.contents = None
+        self.packed = data[end:]
+        shape = [d + 2 for d in self.dims]
+        cells = int(np.prod(shape))
+        if self.packed.size * 8 < cells:
+            raise Exception("Compiled maze is truncated")
+        self.timings["load"] = time.perf_counter() - started
+        started = time.perf_counter()
+        self.maze = np.unpackbits(self.packed, count=cells, bitorder="little").view(bool).reshape(shape)
+        self.set_actions()
+        self.layout()
+        self.timings["build"] = time.perf_counter() - started
 
     def set_actions(self):
         """
-        Construct the action set to be used in expand, of form [(dim_0, "up"), (dim_0, "down"), ...].
+        Construct the action set to be used in expand, of form [(dim_0, "up"), (dim_0, "down"), ...],
+        and the step each action takes along its dimension.
 
         :param action_set: Set of actions that can be taken from a generic state
         :type action_set: list(tuple(int, string), ...)
+        :param moves: Step of +1 or -1 taken by each action along its dimension
+        :type moves: dict(tuple(int, string): int)
         """
         self.action_set = []
+        self.moves = {}
         for dim in range(self.dimensions):
             for action in self.actions:
                 self.action_set.append((dim, action))
-        
+                """Handle that along the penultimate dimension 0 is at the top visually"""
+                if (action == "down") == (dim == self.dimensions - 2):
+                    self.moves[(dim, action)] = 1
+                else:
+                    self.moves[(dim, action)] = -1
+
+    def index(self, state):
+        """
+        Returns the flat index of the given state into self.grid
+
+        :param state: Representation of the state
+        :type state: tuple(int, ...)
+        """
+        index = 0
+        for s, stride in zip(state, self.strides):
+            index += (s + 1) * stride
+        return index
+
+    def decode(self, index):
+        """
+        Returns the state stored at the given flat index into self.grid, the inverse of index
+
+        :param index: Flat index of the state
+        :type index: int
+        """
+        state = []
+        for stride in self.strides:
+            s, index = divmod(index, stride)
+            state.append(s - 1)
+        return tuple(state)
+
+    def endpoints(self):
+        """
+        Returns the start and goal states in the representation used by the searches: flat indices
+        into self.grid if the maze is encoded, otherwise tuples.
+        """
+        if self.encoded:
+            return self.index(self.start), self.index(self.goal)
+        return self.start, self.goal
+
+    def trace(self, node):
+        """
+        Follows the parents of the given node back to the root and returns the solution reaching the
+        node as a tuple of the action list and state list: (actions, states). Encoded states are only
+        converted back to tuples here.
+
+        :param node: Node containing the final state of the solution
+        :type node: Node
+        """
+        actions = []
+        states = []
+        while node.parent is not None:
+            actions.append(node.action)
+            states.append(node.state)
+            node = node.parent
+        actions = list(reversed(actions))
+        states = list(reversed(states))
+        if self.encoded:
+            states = [self.decode(state) for state in states]
+        return (actions, states)
+
+    def cell(self, state):
+        """
+        Returns the flat index into self.grid of a state in the representation used by the searches
+
+        :param state: Representation of the state
+        :type state: tuple(int, ...), or int if the maze is encoded
+        """
+        if self.encoded:
+            return state
+        return self.index(state)
+
+    def visited(self):
+        """
+        Returns a zeroed bitmap with one byte per cell of self.grid, indexed by the flat index of a state.
+        The searches use it in place of a set of explored states.
+        """
+        return bytearray(self.grid.size)
+
     def value(self, maze, state):
         """
-        Simple recursive way to access the value stored at state in maze.
+        Returns the value stored at state in maze, read through its flat index.
         If the state attempts to access a place in maze that is out of index, assume it is a wall character.
         This is done to allow and handle non-uniform lengths along like dimensions. For example, for a typical
         2D maze, this allows variable length rows.
 
         :param maze: Representation of the maze
-        :type maze: nested lists of booleans
+        :type maze: numpy.ndarray(bool) with a wall border
         :param state: Representation of the current state
         :type state: tuple
         :param value: Value stored at state in maze
         :type value: boolean
         """
-        try:
-            for i in range(self.dimensions):
-                maze = maze[state[i]]
-            return maze
-        except:
-            return True
+        for s, n in zip(state, self.dims):
+            if not 0 <= s < n:
+                return True
+        return maze.item(self.index(state))
         
+    def adjacency(self):
+        """
+        Returns the adjacency of the open cells of the maze in compressed sparse row form, building it on
+        first use. The neighbours of the cell with flat index i are neighbours[indptr[i]:indptr[i + 1]],
+        reached by the actions whose index into self.action_set is stored at the same positions of codes.
+        Neighbours are listed in the order of self.action_set, and walls have no neighbours.
+
+        The arrays are returned as memoryviews so that the searches read plain ints from them. The time
+        taken to build them is stored in self.timings["adjacency"], apart from the time of any search.
+
+        :param indptr: Start of the neighbours of each cell, with one extra entry at the end
+        :type indptr: memoryview(int, ...) of length self.grid.size + 1
+        :param neighbours: Flat index of each neighbour
+        :type neighbours: memoryview(int, ...)
+        :param codes: Action code of each neighbour
+        :type codes: memoryview(int, ...)
+        """
+        if self._adjacency is None:
+            begin = time.perf_counter()
+            cells = np.flatnonzero(~self.grid)
+            offsets = np.array([self.offsets[action] for action in self.action_set], dtype=np.int64)
+            """One row per open cell and one column per action; the wall border keeps every index in range"""
+            targets = cells[:, None] + offsets[None, :]
+            passable = ~self.grid[targets]
+            indptr = np.zeros(self.grid.size + 1, dtype=np.int64)
+            indptr[cells + 1] = passable.sum(axis=1)
+            np.cumsum(indptr, out=indptr)
+            neighbours = targets[passable]
+            codes = np.broadcast_to(np.arange(len(offsets), dtype=np.int8), targets.shape)[passable]
+            self._adjacency = (memoryview(indptr), memoryview(neighbours), memoryview(codes))
+            self.timings["adjacency"] = time.perf_counter() - begin
+        return self._adjacency
+
     def expand(self, node):
         """
-        Returns a list of nodes containing the valid states reachable from the given state
+        Returns a list of nodes containing the valid states reachable from the given state, read from
+        the adjacency of the maze
 
         :param node: Current node from which to seek valid states
         :type node: Node
         :param nodes: List of nodes containing valid states
         :type nodes: list of Nodes
         """
+        stats = self.stats
+        if stats is not None and stats.timed:
+            begin = time.perf_counter()
+        indptr, neighbours, codes = self.adjacency()
+        cell = self.cell(node.state)
         nodes = []
-        """Loop over all actions in the action_set"""
-        for action in self.action_set:
-            dim, act = action
-            """Determine state reached by the action, if any"""
-            next = self.transition(node, dim, act)
-            """If a valid state was reached, append it to the list"""
-            if next != None:
-                nodes.append(next)
+        """Loop over the open neighbours of the cell"""
+        for i in range(indptr[cell], indptr[cell + 1]):
+            action = self.action_set[codes[i]]
+            if self.encoded:
+                state = neighbours[i]
+            else:
+                state = list(node.state)
+                state[action[0]] += self.moves[action]
+                state = tuple(state)
+            nodes.append(Node(parent=node, state=state, action=action))
+        """Every call expands one node; outside of a search self.stats may be None"""
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(nodes)
+            if stats.timed:
+                stats.expand_time += time.perf_counter() - begin
         return nodes
 
     def transition(self, node, dim, action):
@@ -362,6 +745,9 @@ class Maze:
         screen. This extrapolates to the penultimate dimension in n-dimensions, and is handled below to
         avoid confusion when reading actions taken in the solution.
 
+        If the maze is encoded, node.state is a flat index into self.grid and the action is applied by
+        adding its precomputed offset.
+
         :param node: Node containing the current state
         :type node: Node
         :param dim: Dimension along which to attempt action
@@ -370,40 +756,22 @@ class Maze:
         :type action: string
         """
         """Ensure action is a valid action"""
-        if action in self.actions:
-            """Generate mutable copy of the current state"""
-            state = list(node.state)
-            """Handle that along the penultimate dimension 0 is at the top visually"""
-            if dim == self.dimensions - 2:
-                if action == "down":
-                    state[dim] += 1
-                else:
-                    state[dim] -= 1
-            else:
-                if action == "up":
-                    state[dim] += 1
-                else:
-                    state[dim] -= 1
-            check = True
-            """Ensure state is still within the proper range along each dimension"""
-            for i in range(self.dimensions):
-                if 0 <= state[i] < self.dims[i]:
-                    continue
-                else:
-                    check = False
-                    break
-            if check:
-                """Ensure the state is traversable, i.e., not a wall"""
-                """If out of bounds, assume it's a wall"""
-                try:
-                    if not self.value(self.maze, state):
-                        """If the state exists and is traversable, return a node with the proper parent, state, and action"""
-                        return Node(parent=node, state=tuple(state), action=(dim,action))
-                except:
-                    return None
-            return None
-        else:
+        try:
+            step = self.moves[(dim, action)]
+        except KeyError:
             raise Exception("action not in actions")
+        """The wall border guarantees the neighbouring flat index lies within the grid"""
+        if self.encoded:
+            state = node.state + self.offsets[(dim, action)]
+            if self.grid[state]:
+                return None
+            return Node(parent=node, state=state, action=(dim, action))
+        if self.grid[self.index(node.state) + step * self.strides[dim]]:
+            return None
+        """If the state is traversable, return a node with the proper parent, state, and action"""
+        state = list(node.state)
+        state[dim] += step
+        return Node(parent=node, state=tuple(state), action=(dim, action))
             
     def goal(self, state):
         """
@@ -420,13 +788,88 @@ class Maze:
         instance.
 
         :param state: Representation of the current state
-        :type state: tuple(int, ...)
+        :type state: tuple(int, ...), or its flat index as int
         """
+        if isinstance(state, int):
+            state = self.decode(state)
         diff = 0
         for g, c in zip(self.goal, tuple(state)):
             diff += (abs(g-c))
         return diff
 
+    def distance_field(self, source=None):
+        """
+        Returns the number of steps from the source state to every cell of the maze, found by breadth
+        first wavefront expansion over the whole grid. Each layer is one vectorized dilation of the
+        previous layer along every dimension, masked by the open cells not yet reached. Walls and cells
+        that cannot be reached from the source are -1.
+
+        :param source: State from which to measure distances, defaults to the goal state
+        :type source: tuple(int, ...)
+        :param field: Steps from the source to each cell
+        :type field: numpy.ndarray(int32) of shape self.dims
+        """
+        if source is None:
+            source = self.goal
+        source = tuple(s + 1 for s in source)
+        passable = ~self.maze
+        field = np.full(self.maze.shape, -1, dtype=np.int32)
+        layer = np.zeros(self.maze.shape, dtype=bool)
+        if passable[source]:
+            field[source] = 0
+            layer[source] = True
+        distance = 0
+        while layer.any():
+            distance += 1
+            grown = np.zeros(self.maze.shape, dtype=bool)
+            """Shift the layer one step up and one step down along each dimension"""
+            for dim in range(self.dimensions):
+                lower = [slice(None)] * self.dimensions
+                upper = [slice(None)] * self.dimensions
+                lower[dim] = slice(None, -1)
+                upper[dim] = slice(1, None)
+                grown[tuple(lower)] |= layer[tuple(upper)]
+                grown[tuple(upper)] |= layer[tuple(lower)]
+            """Keep only open cells not reached by an earlier layer"""
+            layer = grown & passable & (field < 0)
+            field[layer] = distance
+        """Strip the wall border"""
+        return np.ascontiguousarray(field[(slice(1, -1),) * self.dimensions])
+
+    def gradient_path(self, field, state=None):
+        """
+        Follows a distance field down from the given state to the source of the field, then returns
+        the path as a tuple of the action list and state list: (actions, states), in the same form as
+        self.solution. At each step the first action in self.action_set that lowers the distance by one
+        is taken. Returns None if the state cannot reach the source.
+
+        :param field: Steps from the source to each cell, as returned by distance_field
+        :type field: numpy.ndarray(int32) of shape self.dims
+        :param state: State from which to start, defaults to the start state
+        :type state: tuple(int, ...)
+        """
+        if state is None:
+            state = self.start
+        state = tuple(state)
+        distance = int(field[state])
+        if distance < 0:
+            return None
+        actions = []
+        states = []
+        while distance > 0:
+            for action in self.action_set:
+                dim = action[0]
+                next = list(state)
+                next[dim] += self.moves[action]
+                if 0 <= next[dim] < self.dims[dim] and field[tuple(next)] == distance - 1:
+                    break
+            state = tuple(next)
+            distance -= 1
+            actions.append(action)
+            states.append(state)
+        return (actions, states)
+
+    @measured
     def breadth_search(self):
         """
         Conducts a breadth search (queue-like frontier) of the maze beginning from the start state
@@ -435,24 +878,31 @@ class Maze:
 
         To increase efficiency the states are tested as they are added to the frontier instead of as
         they are popped from the frontier.
+        States are also marked in the explored bitmap as they are added to the frontier, so no state is
+        ever added to the frontier twice.
 
         :param self.solution: Representation of the solution, including actions and states
         :type self.solution: tuple(list((int, string), ...), list(tuple(int, ...), ...))
         """
 
-        """Test if the start and goal states are the same"""
+        """Encoded mazes are searched with a NodePool instead of Node objects"""
+        if self.encoded:
+            return self.pool_search("breadth")
+
+        """Test if the start and goal states are the same, which needs no actions"""
         if self.start == self.goal:
-            actions = None
-            states = self.goal
-            self.solution = (actions, states)
+            self.solution = ([], [])
+            return
 
         """Initialize the frontier using a root node storing the start state"""
-        root = Node(parent=None, state=self.start, action=None)
-        frontier = Frontier(root)
+        start, goal = self.endpoints()
+        root = Node(parent=None, state=start, action=None)
+        frontier = self.stats.watch(BreadthFrontier(root))
         """Initialize the solution"""
         self.solution = None
-        """Initialize the explored set"""
-        explored = set()
+        """Initialize the explored bitmap"""
+        explored = self.stats.track(self.visited())
+        explored[self.cell(start)] = 1
 
         """Loop until either the solution is found or the frontier is empty"""
         while True:
@@ -461,31 +911,41 @@ class Maze:
                 if frontier.empty():
                     return
                 """Breadth search uses a queue-like (FIFO) frontier of nodes"""
-                current = frontier.remove(0)
-                """Once is state is chosen to be explored, add to the explored set"""
-                explored.add(current.state)
+                current = frontier.remove()
                 """Determine the states reachable from the chosen state"""
                 nodes = self.expand(current)
                 for node in nodes:
                     """If the state is the goal state, construct the solution and end"""
-                    if node.state == self.goal:
-                        actions = []
-                        states = []
-                        while node.parent is not None:
-                            actions.append(node.action)
-                            states.append(node.state)
-                            node = node.parent
-                        actions = list(reversed(actions))
-                        states = list(reversed(states))
-                        self.solution = (actions, states)
+                    if node.state == goal:
+                        self.solution = self.trace(node)
                         return
                     else:
-                        """If not the goal state and not explored before, add it to the frontier"""
-                        if not tuple(node.state) in explored:
+                        """If not the goal state and not seen before, mark it and add it to the frontier"""
+                        cell = self.cell(node.state)
+                        if not explored[cell]:
+                            explored[cell] = 1
                             frontier.add(node)
             except:
                 raise Exception("Error in solving")
 
+    @measured
+    def parallel_search(self, workers=None, chunk=4096):
+        """
+        Conducts a level-synchronous breadth search of the maze, expanding large layers in several worker
+        processes that share the occupancy grid and the visited bitmap, then stores the solution as a
+        tuple of the action list and state list that reaches the goal state: (actions, states). The
+        solution is identical to the one found by breadth_search. See parallel.level_search.
+
+        :param workers: Number of worker processes, defaults to the number of cores; 1 starts none
+        :type workers: int
+        :param chunk: Number of cells of a layer expanded by a worker at a time
+        :type chunk: int
+        :param self.solution: Representation of the solution, including actions and states
+        :type self.solution: tuple(list((int, string), ...), list(tuple(int, ...), ...))
+        """
+        self.solution = level_search(self, workers, chunk)
+
+    @measured
     def depth_search(self):
         """
         Conducts a depth search (stack-like frontier) of the maze beginning from the start state seeking
@@ -501,20 +961,25 @@ class Maze:
         :type self.solution: tuple(list((int, string), ...), list(tuple(int, ...), ...))
         """
 
-        """Test if the start and goal states are the same"""
+        """Encoded mazes are searched with a NodePool instead of Node objects"""
+        if self.encoded:
+            return self.pool_search("depth")
+
+        """Test if the start and goal states are the same, which needs no actions"""
         if self.start == self.goal:
-            actions = None
-            states = self.goal
-            self.solution = (actions, states)
+            self.solution = ([], [])
+            return
 
         """Initialize the frontier using a root node storing the start state"""
-        root = Node(parent=None, state=self.start, action=None)
-        frontier = Frontier(root)
+        start, goal = self.endpoints()
+        root = Node(parent=None, state=start, action=None)
+        frontier = self.stats.watch(Frontier(root))
         
         """Initialize the solution"""
         self.solution = None
-        """Initialize the explored set"""
-        explored = set()
+        """Initialize the explored bitmap"""
+        explored = self.stats.track(self.visited())
+        explored[self.cell(start)] = 1
 
         """Loop until either the solution is found or the frontier is empty"""
         while True:
@@ -524,62 +989,66 @@ class Maze:
                     return
                 """Depth search uses a stack-like (LIFO) frontier of nodes"""
                 current = frontier.remove()
-                """Once is state is chosen to be explored, add to the explored set"""
-                explored.add(current.state)
                 """Determine the states reachable from the chosen state"""
                 nodes = self.expand(current)
                 for node in nodes:
                     """If the state is the goal state, construct the solution and end"""
-                    if node.state == self.goal:
-                        actions = []
-                        states = []
-                        while node.parent is not None:
-                            actions.append(node.action)
-                            states.append(node.state)
-                            node = node.parent
-                        actions = list(reversed(actions))
-                        states = list(reversed(states))
-                        self.solution = (actions, states)
+                    if node.state == goal:
+                        self.solution = self.trace(node)
                         return
                     else:
-                        """If not the goal state and not explored before, add it to the frontier"""
-                        if not tuple(node.state) in explored:
+                        """If not the goal state and not seen before, mark it and add it to the frontier"""
+                        cell = self.cell(node.state)
+                        if not explored[cell]:
+                            explored[cell] = 1
                             frontier.add(node)
             except:
                 raise Exception("Error in solving")
 
-    def greedy_search(self):
+    @measured
+    def greedy_search(self, heuristic=None):
         """
         Conducts a greedy search of the maze beginning from the start state seeking
         the goal state, then stores the solution as a tuple of the action list and state list that
         reaches the goal state: (actions, states). The greedy search selects from the frontier by
         determining which state in the frontier has the lowest estimated cost to the goal state. Here,
-        the estimate is generated using the manhatten distance.
+        the estimate is generated using the manhatten distance, unless another heuristic is given.
 
         To increase efficiency the states are tested as they are added to the frontier instead of as they
         are popped from the frontier.
 
         Functions as the breadth_search, with the exception of the frontier behavior.
 
+        :param heuristic: Estimated cost to reach the goal from a state, defaults to manhatten_distance
+        :type heuristic: function(state) -> int
         :param self.solution: Representation of the solution, including actions and states
         :type self.solution: tuple(list((int, string), ...), list(tuple(int, ...), ...))
+        :param self.stats: Counters and timings of the search
+        :type self.stats: Stats
         """
 
-        """Test if the start and goal states are the same"""
+        """Encoded mazes are searched with a NodePool instead of Node objects"""
+        if self.encoded:
+            return self.pool_search("greedy", heuristic)
+
+        """Test if the start and goal states are the same, which needs no actions"""
         if self.start == self.goal:
-            actions = None
-            states = self.goal
-            self.solution = (actions, states)
+            self.solution = ([], [])
+            return
 
         """Initialize the frontier using a root node storing the start state"""
-        root = Node(parent=None, state=self.start, action=None)
-        root.cost = self.manhatten_distance(root.state)
-        frontier = Frontier(root)
+        if heuristic is None:
+            heuristic = self.manhatten_distance
+        start, goal = self.endpoints()
+        root = Node(parent=None, state=start, action=None)
+        root.cost = heuristic(root.state)
+        frontier = self.stats.watch(PriorityFrontier(root, priority=lambda node: node.cost))
 
         """Initialize the solution"""
         self.solution = None
-        """Initialize the explored set"""
-        explored = set()
+        """Initialize the explored bitmap"""
+        explored = self.stats.track(self.visited())
+        explored[self.cell(start)] = 1
 
         """Loop until either the solution is found or the frontier is empty"""
         while True:
@@ -588,66 +1057,74 @@ class Maze:
                 if frontier.empty():
                     return
                 """Greedy search uses the manhatten distance to pop a node from the frontier"""
-                index = frontier.greedy_index()
-                current = frontier.remove(index)
-                """Once is state is chosen to be explored, add to the explored set"""
-                explored.add(current.state)
+                current = frontier.remove()
                 """Determine the states reachable from the chosen state"""
                 nodes = self.expand(current)
                 for node in nodes:
                     """If the state is the goal state, construct the solution and end"""
-                    if node.state == self.goal:
-                        actions = []
-                        states = []
-                        while node.parent is not None:
-                            actions.append(node.action)
-                            states.append(node.state)
-                            node = node.parent
-                        actions = list(reversed(actions))
-                        states = list(reversed(states))
-                        self.solution = (actions, states)
+                    if node.state == goal:
+                        self.solution = self.trace(node)
                         return
                     else:
-                        """If not the goal state and not explored before, add it to the frontier"""
-                        if not tuple(node.state) in explored:
-                            node.cost = self.manhatten_distance(node.state)
+                        """If not the goal state and not seen before, mark it and add it to the frontier"""
+                        cell = self.cell(node.state)
+                        if not explored[cell]:
+                            explored[cell] = 1
+                            node.cost = heuristic(node.state)
                             frontier.add(node)
             except:
                 raise Exception("Error in solving")
 
-    def astar_search(self):
+    @measured
+    def astar_search(self, heuristic=None):
         """
         Conducts an astar search of the maze beginning from the start state seeking
         the goal state, then stores the solution as a tuple of the action list and state list that
         reaches the goal state: (actions, states). The astar search selects from the frontier by
         determining which state in the frontier has the lowest steps plus estimated cost to the goal
         state. Here, the steps are calculated as the number of actions from the start state and the
-        estimated cost is generated using the manhatten distance.
+        estimated cost is generated using the manhatten distance, unless another heuristic is given. The
+        solution is only as short as possible if the heuristic never overestimates.
 
         To increase efficiency the states are tested as they are added to the frontier instead of as they
         are popped from the frontier.
 
+        Unlike the other searches, states are marked explored as they are popped, since a state already
+        in the frontier may later be reached in fewer steps. The frontier keeps only the best entry for
+        each state.
+
         Functions as the breadth_search, with the exception of the frontier behavior.
 
+        :param heuristic: Estimated cost to reach the goal from a state, defaults to manhatten_distance
+        :type heuristic: function(state) -> int
         :param self.solution: Representation of the solution, including actions and states
         :type self.solution: tuple(list((int, string), ...), list(tuple(int, ...), ...))
+        :param self.stats: Counters and timings of the search
+        :type self.stats: Stats
         """
 
-        """Test if the start and goal states are the same"""
+        """Encoded mazes are searched with a NodePool instead of Node objects"""
+        if self.encoded:
+            return self.pool_search("astar", heuristic)
+
+        """Test if the start and goal states are the same, which needs no actions"""
         if self.start == self.goal:
-            actions = None
-            states = self.goal
-            self.solution = (actions, states)
+            self.solution = ([], [])
+            return
 
         """Initialize the frontier using a root node storing the start state"""
-        root = Node(parent=None, state=self.start, action=None)
-        root.cost = self.manhatten_distance(root.state)
-        frontier = Frontier(root)
+        if heuristic is None:
+            heuristic = self.manhatten_distance
+        start, goal = self.endpoints()
+        root = Node(parent=None, state=start, action=None)
+        root.cost = heuristic(root.state)
+        """Among nodes of equal steps plus cost, the one estimated nearest the goal is popped first"""
+        frontier = self.stats.watch(PriorityFrontier(root, priority=lambda node: (node.steps + node.cost, node.cost)))
 
         """Initialize the solution"""
         self.solution = None
-        """Initialize the explored set"""
-        explored = set()
+        """Initialize the explored bitmap"""
+        explored = self.stats.track(self.visited())
 
         """Loop until either the solution is found or the frontier is empty"""
         while True:
@@ -656,33 +1133,25 @@ class Maze:
                 if frontier.empty():
                     return
                 """Astar search uses steps taken + manhatten distance to pop a node from the frontier"""
-                index = frontier.astar_index()
-                current = frontier.remove(index)
-                """Once is state is chosen to be explored, add to the explored set"""
-                explored.add(current.state)
+                current = frontier.remove()
+                """Once is state is chosen to be explored, mark it explored"""
+                explored[self.cell(current.state)] = 1
                 """Determine the states reachable from the chosen state"""
                 nodes = self.expand(current)
                 for node in nodes:
                     """If the state is the goal state, construct the solution and end"""
-                    if node.state == self.goal:
-                        actions = []
-                        states = []
-                        while node.parent is not None:
-                            actions.append(node.action)
-                            states.append(node.state)
-                            node = node.parent
-                        actions = list(reversed(actions))
-                        states = list(reversed(states))
-                        self.solution = (actions, states)
+                    if node.state == goal:
+                        self.solution = self.trace(node)
                         return
                     else:
-                        if not tuple(node.state) in explored:
+                        if not explored[self.cell(node.state)]:
                             """If not the goal state and not explored before, add it to the frontier"""
-                            node.cost = self.manhatten_distance(node.state)
+                            node.cost = heuristic(node.state)
                             frontier.add(node)
             except:
                 raise Exception("Error in solving")
 
+    @measured
     def random_search(self):
         """
         Conducts a random search of the maze beginning from the start state seeking
@@ -699,23 +1168,28 @@ class Maze:
         :type self.solution: tuple(list((int, string), ...), list(tuple(int, ...), ...))
         """
 
-        """Test if the start and goal states are the same"""
+        """Encoded mazes are searched with a NodePool instead of Node objects"""
+        if self.encoded:
+            return self.pool_search("random")
+
+        """Test if the start and goal states are the same, which needs no actions"""
         if self.start == self.goal:
-            actions = None
-            states = self.goal
-            self.solution = (actions, states)
+            self.solution = ([], [])
+            return
 
         """Initialize the frontier using a root node storing the start state"""
-        root = Node(parent=None, state=self.start, action=None)
-        frontier = Frontier(root)
+        start, goal = self.endpoints()
+        root = Node(parent=None, state=start, action=None)
+        frontier = self.stats.watch(Frontier(root))
         """Seed the random generator"""
         if SEED:
             random.seed(SEED)
         
         """Initialize the solution"""
         self.solution = None
-        """Initialize the explored set"""
-        explored = set()
+        """Initialize the explored bitmap"""
+        explored = self.stats.track(self.visited())
+        explored[self.cell(start)] = 1
 
         """Loop until either the solution is found or the frontier is empty"""
         while True:
@@ -726,28 +1200,541 @@ class Maze:
                 """Random search pops a node randomly from the frontier"""
                 index = random.randrange(len(frontier.frontier))
                 current = frontier.remove(index)
-                """Once is state is chosen to be explored, add to the explored set"""
-                explored.add(current.state)
                 """Determine the states reachable from the chosen state"""
                 nodes = self.expand(current)
                 for node in nodes:
                     """If the state is the goal state, construct the solution and end"""
-                    if node.state == self.goal:
-                        actions = []
-                        states = []
-                        while node.parent is not None:
-                            actions.append(node.action)
-                            states.append(node.state)
-                            node = node.parent
-                        actions = list(reversed(actions))
-                        states = list(reversed(states))
-                        self.solution = (actions, states)
+                    if node.state == goal:
+                        self.solution = self.trace(node)
                         return
                     else:
-                        """If not the goal state and not explored before, add it to the frontier"""
-                        if not tuple(node.state) in explored:
+                        """If not the goal state and not seen before, mark it and add it to the frontier"""
+                        cell = self.cell(node.state)
+                        if not explored[cell]:
+                            explored[cell] = 1
                             frontier.add(node)
             except:
                 raise Exception("Error in solving")
 
+    @measured
+    def jump_point_search(self):
+        """
+        Conducts a jump point search of the maze beginning from the start state seeking the goal state,
+        then stores the solution as a tuple of the action list and state list that reaches the goal
+        state: (actions, states). The solution is as short as the one found by astar_search.
+
+        Jump point search is an astar search over only a few states of the maze, the jump points. From
+        a jump point the search moves straight along each of its directions, skipping every state that
+        any shortest path can equally avoid, until it reaches the goal or another jump point. Dimensions
+        are ranked in order, the first dimension being the highest, and a state reached moving along
+        dimension k is a jump point if
+            - a neighbour along a higher dimension is open while the same neighbour of the previous
+              state is a wall (a forced neighbour), or
+            - a jump along any lower dimension from the state finds a jump point.
+        A jump point is expanded along its direction of arrival, both directions of every lower
+        dimension, and the directions of its forced neighbours. The start state is expanded along
+        every direction.
+
+        The moves between jump points are filled back in once the goal is found, one action at a time.
+
+        :param self.solution: Representation of the solution, including actions and states
+        :type self.solution: tuple(list((int, string), ...), list(tuple(int, ...), ...))
+        :param self.stats: Counters and timings of the search, counting jump points as states
+        :type self.stats: Stats
+        """
+        walls = memoryview(self.grid)
+        start = self.index(self.start)
+        goal = self.index(self.goal)
+        offsets = [self.offsets[action] for action in self.action_set]
+        dims = [action[0] for action in self.action_set]
+        """Action codes along the dimensions ranked above and below each dimension"""
+        higher = [[c for c, d in enumerate(dims) if d < dim] for dim in range(self.dimensions)]
+        lower = [[c for c, d in enumerate(dims) if d > dim] for dim in range(self.dimensions)]
+
+        def jump(cell, code):
+            """Returns the next jump point from cell along the direction of code, or -1 if there is none"""
+            offset = offsets[code]
+            dim = dims[code]
+            while True:
+                next = cell + offset
+                if walls[next]:
+                    return -1
+                if next == goal:
+                    return next
+                for c in higher[dim]:
+                    if not walls[next + offsets[c]] and walls[cell + offsets[c]]:
+                        return next
+                for c in lower[dim]:
+                    if jump(next, c) != -1:
+                        return next
+                cell = next
+
+        """For each jump point, its steps from the start and the (jump point, code) it was reached from"""
+        steps = {start: 0}
+        came = {start: (-1, -1)}
+        frontier = PriorityFrontier(start, priority=lambda cell: steps[cell] + self.manhatten_distance(cell),
+                                    key=lambda cell: cell)
+        frontier = self.stats.watch(frontier)
+        explored = self.stats.track(self.visited())
+        self.solution = None
+        stats = self.stats
+
+        while not frontier.empty():
+            current = frontier.remove()
+            if current == goal:
+                break
+            explored[current] = 1
+            stats.expanded += 1
+            """Time spent jumping, apart from the time spent adding to the frontier"""
+            if stats.timed:
+                begin = time.perf_counter()
+                before = stats.frontier_time
+            arrival = came[current][1]
+            if arrival == -1:
+                directions = range(len(offsets))
+            else:
+                """Continue straight, turn along lower dimensions, and turn toward forced neighbours"""
+                previous = current - offsets[arrival]
+                directions = [arrival] + lower[dims[arrival]]
+                for c in higher[dims[arrival]]:
+                    if not walls[current + offsets[c]] and walls[previous + offsets[c]]:
+                        directions.append(c)
+            for code in directions:
+                point = jump(current, code)
+                if point == -1:
+                    continue
+                stats.generated += 1
+                if explored[point]:
+                    continue
+                total = steps[current] + (point - current) // offsets[code]
+                if point not in steps or total < steps[point]:
+                    steps[point] = total
+                    came[point] = (current, code)
+                    frontier.add(point)
+            if stats.timed:
+                stats.expand_time += time.perf_counter() - begin - (stats.frontier_time - before)
+        else:
+            return
+
+        """Fill in every move between consecutive jump points"""
+        actions = []
+        states = []
+        cell = goal
+        while came[cell][0] != -1:
+            parent, code = came[cell]
+            for i in range((cell - parent) // offsets[code], 0, -1):
+                actions.append(self.action_set[code])
+                states.append(parent + i * offsets[code])
+            cell = parent
+        actions.reverse()
+        states.reverse()
+        self.solution = (actions, [self.decode(state) for state in states])
+
+    @measured
+    def ida_star_search(self, table=0):
+        """
+        Conducts an iterative deepening astar search of the maze beginning from the start state seeking
+        the goal state, then stores the solution as a tuple of the action list and state list that
+        reaches the goal state: (actions, states).
+
+        Each iteration is a depth first search that abandons any state whose steps plus manhatten
+        distance exceed a threshold. The first threshold is the manhatten distance of the start state,
+        and each following threshold is the lowest value that exceeded the one before, so the first
+        solution found is as short as the one found by astar_search. Only the current path is kept in
+        memory, so memory grows with the depth of the path instead of the size of the maze.
+
+        An optional transposition table remembers the fewest steps at which each state was reached in
+        the current iteration, and prunes later visits that reach it in as many steps or more. The
+        table holds at most 'table' states; once full, states not already in it are not added.
+
+        :param table: Maximum number of states in the transposition table, 0 for no table
+        :type table: int
+        :param self.solution: Representation of the solution, including actions and states
+        :type self.solution: tuple(list((int, string), ...), list(tuple(int, ...), ...))
+        :param self.iterations: Threshold and number of nodes generated for each iteration
+        :type self.iterations: list(tuple(int, int), ...)
+        """
+        indptr, neighbours, codes = self.adjacency()
+        start = self.index(self.start)
+        goal = self.index(self.goal)
+        self.solution = None
+        self.iterations = []
+        threshold = self.manhatten_distance(self.start)
+        stats = self.stats
+
+        while True:
+            """There is no frontier, so all the time of an iteration is spent expanding"""
+            begin = time.perf_counter()
+            """The path, the action code reaching each state on it, and the next neighbour to try from each"""
+            path = [start]
+            actions = [-1]
+            stack = [indptr[start]]
+            on_path = {start}
+            transpositions = {}
+            nodes = 1
+            exceeded = None
+            found = start == goal
+
+            while stack and not found:
+                cell = path[-1]
+                i = stack[-1]
+                """Once every neighbour has been tried, backtrack"""
+                if i == indptr[cell + 1]:
+                    on_path.discard(path.pop())
+                    actions.pop()
+                    stack.pop()
+                    continue
+                stack[-1] = i + 1
+                next = neighbours[i]
+                stats.generated += 1
+                if next in on_path:
+                    continue
+                steps = len(path)
+                cost = steps + self.manhatten_distance(next)
+                if cost > threshold:
+                    if exceeded is None or cost < exceeded:
+                        exceeded = cost
+                    continue
+                if table:
+                    if transpositions.get(next, steps + 1) <= steps:
+                        continue
+                    if next in transpositions or len(transpositions) < table:
+                        transpositions[next] = steps
+                nodes += 1
+                path.append(next)
+                actions.append(codes[i])
+                stack.append(indptr[next])
+                on_path.add(next)
+                found = next == goal
+                stats.touch(len(stack), len(path) + len(transpositions))
+
+            self.iterations.append((threshold, nodes))
+            stats.expanded += nodes
+            if stats.timed:
+                stats.expand_time += time.perf_counter() - begin
+            if found:
+                self.solution = ([self.action_set[code] for code in actions[1:]], [self.decode(cell) for cell in path[1:]])
+                return
+            """If no state exceeded the threshold, every reachable state was searched"""
+            if exceeded is None:
+                return
+            threshold = exceeded
+
+    def reverse(self, action):
+        """
+        Returns the action that undoes the given action, i.e., the action along the same dimension that
+        steps the other way. Since the penultimate dimension counts from the top of the screen, this is
+        taken from self.moves rather than assumed from the action names.
+
+        :param action: Action to be undone
+        :type action: tuple(int, string)
+        """
+        dim = action[0]
+        for other in self.action_set:
+            if other[0] == dim and self.moves[other] == -self.moves[action]:
+                return other
+        raise Exception("action not in actions")
+
+    @measured
+    def bidirectional_search(self):
+        """
+        Conducts a breadth search of the maze from both the start state and the goal state at once,
+        always growing the smaller of the two frontiers by one full layer, until the searches meet.
+        The solution is stored as a tuple of the action list and state list that reaches the goal state:
+        (actions, states).
+
+        When a layer touches a state already reached by the other search, the rest of the layer is still
+        expanded and the meeting state with the fewest total steps is kept, so the solution is as short
+        as the one found by breadth_search. The actions found by the search from the goal state lead
+        away from the goal, so they are reversed before being added to the solution.
+
+        :param self.solution: Representation of the solution, including actions and states
+        :type self.solution: tuple(list((int, string), ...), list(tuple(int, ...), ...))
+        """
+        indptr, neighbours, codes = self.adjacency()
+        start = self.index(self.start)
+        goal = self.index(self.goal)
+        self.solution = None
+        """For each side, map every reached cell to its (parent cell, action code, steps)"""
+        forward = {start: (-1, -1, 0)}
+        backward = {goal: (-1, -1, 0)}
+        forward_layer = [start]
+        backward_layer = [goal]
+        meet = start if start in backward else None
+        stats = self.stats
+
+        while meet is None and forward_layer and backward_layer:
+            """Both layers together are the frontier; there is no frontier to add to or remove from"""
+            stats.touch(len(forward_layer) + len(backward_layer), len(forward) + len(backward))
+            begin = time.perf_counter()
+            """Grow the side with the smaller frontier"""
+            if len(forward_layer) <= len(backward_layer):
+                reached, other, layer = forward, backward, forward_layer
+            else:
+                reached, other, layer = backward, forward, backward_layer
+            best = None
+            grown = []
+            stats.expanded += len(layer)
+            for cell in layer:
+                steps = reached[cell][2] + 1
+                stats.generated += indptr[cell + 1] - indptr[cell]
+                for i in range(indptr[cell], indptr[cell + 1]):
+                    next = neighbours[i]
+                    if next in reached:
+                        continue
+                    reached[next] = (cell, codes[i], steps)
+                    grown.append(next)
+                    if next in other:
+                        total = steps + other[next][2]
+                        if best is None or total < best:
+                            best = total
+                            meet = next
+            if reached is forward:
+                forward_layer = grown
+            else:
+                backward_layer = grown
+            if stats.timed:
+                stats.expand_time += time.perf_counter() - begin
+        stats.touch(len(forward_layer) + len(backward_layer), len(forward) + len(backward))
+
+        if meet is None:
+            return
+        """Walk from the meeting state back to the start, then forward to the goal"""
+        actions = []
+        states = []
+        cell = meet
+        while forward[cell][0] != -1:
+            parent, code, steps = forward[cell]
+            actions.append(self.action_set[code])
+            states.append(cell)
+            cell = parent
+        actions.reverse()
+        states.reverse()
+        cell = meet
+        while backward[cell][0] != -1:
+            parent, code, steps = backward[cell]
+            actions.append(self.reverse(self.action_set[code]))
+            states.append(parent)
+            cell = parent
+        self.solution = (actions, [self.decode(state) for state in states])
+
+    def pool_search(self, order, heuristic=None):
+        """
+        Conducts the search named by order over encoded states, storing the nodes in a NodePool instead
+        of Node objects, then stores the solution as a tuple of the action list and state list that
+        reaches the goal state: (actions, states). Called by the search methods when the maze is encoded.
+
+        Nodes are indices into the pool and the frontiers hold those indices. Neighbours are read
+        directly from the adjacency of the maze. Actions are stored as their index into
+        self.action_set, and both actions and states are only converted back once the solution is found.
+
+        :param order: Frontier behavior, one of "breadth", "depth", "greedy", "astar" or "random"
+        :type order: string
+        :param heuristic: Estimated cost to reach the goal for greedy and astar, defaults to manhatten_distance
+        :type heuristic: function(int) -> int
+        :param self.solution: Representation of the solution, including actions and states
+        :type self.solution: tuple(list((int, string), ...), list(tuple(int, ...), ...))
+        :param self.stats: Counters and timings of the search
+        :type self.stats: Stats
+        """
+        start, goal = self.endpoints()
+        if start == goal:
+            self.solution = ([], [])
+            return
+        pool = NodePool()
+        root = pool.add(-1, start, -1, 0)
+        states = pool.state
+        steps = pool.steps
+        if heuristic is None:
+            heuristic = self.manhatten_distance
+        if order == "breadth":
+            frontier = BreadthFrontier(root)
+        elif order == "depth" or order == "random":
+            frontier = Frontier(root)
+        elif order == "greedy":
+            frontier = PriorityFrontier(root, priority=lambda node: heuristic(states[node]),
+                                        key=states.__getitem__)
+        elif order == "astar":
+            def priority(node):
+                """Steps plus cost, ties going to the lower cost as in astar_search"""
+                cost = heuristic(states[node])
+                return (steps[node] + cost, cost)
+            frontier = PriorityFrontier(root, priority=priority, key=states.__getitem__)
+        else:
+            raise Exception("order not in breadth, depth, greedy, astar, or random")
+        if SEED and order == "random":
+            random.seed(SEED)
+        frontier = self.stats.watch(frontier)
+
+        self.solution = None
+        indptr, neighbours, codes = self.adjacency()
+        """As in astar_search, astar marks states as they are popped and the others as they are added"""
+        late = order == "astar"
+        explored = self.stats.track(self.visited())
+        if not late:
+            explored[start] = 1
+        stats = self.stats
+
+        while not frontier.empty():
+            if order == "random":
+                current = frontier.remove(random.randrange(frontier.length()))
+            else:
+                current = frontier.remove()
+            state = states[current]
+            stats.expanded += 1
+            stats.generated += indptr[state + 1] - indptr[state]
+            if late:
+                explored[state] = 1
+            step = steps[current] + 1
+            """Time spent generating nodes, apart from the time spent adding to the frontier"""
+            if stats.timed:
+                begin = time.perf_counter()
+                before = stats.frontier_time
+            for i in range(indptr[state], indptr[state + 1]):
+                next = neighbours[i]
+                if explored[next]:
+                    continue
+                node = pool.add(current, next, codes[i], step)
+                if next == goal:
+                    codes, cells = pool.trace(node)
+                    self.solution = ([self.action_set[code] for code in codes], [self.decode(cell) for cell in cells])
+                    return
+                if not late:
+                    explored[next] = 1
+                frontier.add(node)
+            if stats.timed:
+                stats.expand_time += time.perf_counter() - begin - (stats.frontier_time - before)
 
+    def solve(self, start=None, goal=None, strategy="astar", cache=None):
+        """
+        Searches for a path from start to goal with the named strategy and returns the solution as a
+        tuple of the action list and state list that reaches the goal state: (actions, states), or None
+        if there is no solution. Start and goal default to those of the maze. A start equal to the goal
+        gives ([], []) whatever the strategy.
+
+        Unlike the search methods, solve leaves the maze untouched: the search runs on a shallow copy
+        whose start, goal, and solution are its own, while the occupancy grid and adjacency are shared.
+        Any number of queries may therefore be made against one maze.
+
+        If a SolutionCache is given, a solution it holds for the same maze, strategy, start and goal is
+        returned without searching, and a new solution is stored in it. The random strategy is never
+        cached, since each search may find a different solution.
+
+        :param start: State from which to search
+        :type start: tuple(int, ...)
+        :param goal: State to reach
+        :type goal: tuple(int, ...)
+        :param strategy: Key of self.strategies
+        :type strategy: string
+        :param cache: Cache of solutions to consult
+        :type cache: SolutionCache
+        """
+        if strategy not in self.strategies:
+            raise ValueError(f"strategy must be one of {', '.join(self.strategies)}")
+        query = copy.copy(self)
+        query.start = self.start if start is None else tuple(start)
+        query.goal = self.goal if goal is None else tuple(goal)
+        for state in (query.start, query.goal):
+            if len(state) != self.dimensions or self.value(self.maze, state):
+                raise ValueError(f"{state} is not an open state of the maze")
+        """A start at the goal needs no actions, whatever the strategy"""
+        if query.start == query.goal:
+            return ([], [])
+        if strategy == "random":
+            cache = None
+        if cache is not None:
+            found, solution = cache.get(self, strategy, query.start, query.goal)
+            if found:
+                return solution
+            cache.adjacency(self)
+        """Build the adjacency once here so every copy shares it"""
+        self.adjacency()
+        query.solution = None
+        getattr(query, self.strategies[strategy])()
+        if cache is not None:
+            cache.put(self, strategy, query.solution, query.start, query.goal)
+        return query.solution
+
+    def breadth_tree(self, source, targets=None):
+        """
+        Conducts a breadth search from the source over the whole maze and returns the search tree as the
+        action code leading into each cell, indexed by the flat index of the cell into self.grid, with -1
+        for the source and for cells not reached. If targets are given, the search stops once all of
+        them have been reached.
+
+        :param source: State from which to search
+        :type source: tuple(int, ...)
+        :param targets: States whose paths are needed
+        :type targets: list(tuple(int, ...), ...)
+        """
+        indptr, neighbours, codes = self.adjacency()
+        tree = array('b', [-1]) * self.grid.size
+        root = self.index(source)
+        seen = self.visited()
+        seen[root] = 1
+        remaining = set()
+        if targets is not None:
+            remaining = {self.index(target) for target in targets}
+            remaining.discard(root)
+        layer = [root]
+        while layer and (targets is None or remaining):
+            grown = []
+            for cell in layer:
+                for i in range(indptr[cell], indptr[cell + 1]):
+                    next = neighbours[i]
+                    if seen[next]:
+                        continue
+                    seen[next] = 1
+                    tree[next] = codes[i]
+                    remaining.discard(next)
+                    grown.append(next)
+            layer = grown
+        return tree
+
+    def branch(self, tree, source, target):
+        """
+        Returns the path from source to target in a tree returned by breadth_tree, as a tuple of the
+        action list and state list: (actions, states), or None if the target was not reached
+
+        :param tree: Action code leading into each cell
+        :type tree: array(int, ...)
+        :param source: Root of the tree
+        :type source: tuple(int, ...)
+        :param target: State to reach
+        :type target: tuple(int, ...)
+        """
+        root = self.index(source)
+        cell = self.index(target)
+        actions = []
+        states = []
+        while cell != root:
+            code = tree[cell]
+            if code == -1:
+                return None
+            actions.append(self.action_set[code])
+            states.append(cell)
+            cell -= self.offsets[self.action_set[code]]
+        actions.reverse()
+        states.reverse()
+        return (actions, [self.decode(state) for state in states])
+
+    def solve_many(self, pairs):
+        """
+        Returns the shortest solution for each (start, goal) pair, in the order given, each as a tuple of
+        the action list and state list: (actions, states), or None if the goal cannot be reached. Pairs
+        are grouped by start state and a single breadth search tree is grown from each distinct start,
+        only until every goal of that start has been reached, instead of one search per pair. The maze
+        itself is left untouched.
+
+        :param pairs: Start and goal states of each query
+        :type pairs: list(tuple(tuple(int, ...), tuple(int, ...)), ...)
+        """
+        groups = {}
+        for i, (start, goal) in enumerate(pairs):
+            groups.setdefault(tuple(start), []).append((i, tuple(goal)))
+        solutions = [None] * len(pairs)
+        for start, queries in groups.items():
+            tree = self.breadth_tree(start, [goal for i, goal in queries])
+            for i, goal in queries:
+                solutions[i] = self.branch(tree, start, goal)
+        return solutions
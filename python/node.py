@@ -1,4 +1,5 @@
 """Generates a Node for use in searching a maze"""
+from array import array
 
 class Node():
     """
@@ -20,10 +21,13 @@ class Node():
     :param cost: Estimated cost to reach goal
     :type cost: int
     """
+    __slots__ = ("_parent", "_state", "_action", "_steps", "_cost")
+
     def __init__(self, parent=None, state=None, action=None):
         self._parent = parent
         self._state = state
         self._action = action
+        self._cost = None
         if parent:
             self._steps = parent.steps + 1
         else:
@@ -76,7 +80,7 @@ class Node():
     def cost(self):
         return self._cost
 
-    @steps.setter
+    @cost.setter
     def cost(self, cost):
         self._cost = cost
 
@@ -91,5 +95,74 @@ class Node():
             self._steps = parent.steps + 1
         else:
             self._steps = 0
-        
 
+
+"""Stores the nodes of a search as parallel arrays"""
+class NodePool():
+    """
+    The NodePool is a compact alternative to Node objects for searches over encoded (integer) states.
+    Each node is an index into parallel arrays holding its parent index, state, action code and steps,
+    so a node costs a few dozen bytes instead of a full object. Paths are recovered by walking parent
+    indices back to the root, whose parent is -1.
+
+    :param parent: Index of the parent of each node, -1 for the root
+    :type parent: array(int, ...)
+    :param state: Encoded state of each node
+    :type state: array(int, ...)
+    :param action: Code of the action taken to reach each node, -1 for the root
+    :type action: array(int, ...)
+    :param steps: Steps to reach each node
+    :type steps: array(int, ...)
+    """
+    def __init__(self):
+        self._parent = array('q')
+        self._state = array('q')
+        self._action = array('b')
+        self._steps = array('q')
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def action(self):
+        return self._action
+
+    @property
+    def steps(self):
+        return self._steps
+
+    def length(self):
+        """
+        Returns the number of nodes in the pool
+        """
+        return len(self._state)
+
+    def add(self, parent, state, action, steps):
+        """
+        Stores a new node and returns its index
+        """
+        self._parent.append(parent)
+        self._state.append(state)
+        self._action.append(action)
+        self._steps.append(steps)
+        return len(self._state) - 1
+
+    def trace(self, index):
+        """
+        Follows the parents of the given node back to the root and returns the action codes and
+        states along the way, from the first step to the given node: (actions, states)
+        """
+        actions = []
+        states = []
+        while self._parent[index] != -1:
+            actions.append(self._action[index])
+            states.append(self._state[index])
+            index = self._parent[index]
+        actions.reverse()
+        states.reverse()
+        return (actions, states)
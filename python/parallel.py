@@ -0,0 +1,142 @@
+"""Level-synchronous breadth search expanded by several processes at once"""
+import time
+from array import array
+from multiprocessing import Pool, current_process
+from multiprocessing.shared_memory import SharedMemory
+
+"""Shared occupancy, visited bitmap and action offsets, attached once in every worker process"""
+_shared = None
+
+def attach(walls, visited, offsets):
+    """
+    Initializes a worker process by attaching the shared memory blocks named walls and visited
+    """
+    global _shared
+    walls = SharedMemory(name=walls)
+    visited = SharedMemory(name=visited)
+    """The SharedMemory objects are kept so their buffers stay mapped"""
+    _shared = (walls, visited, walls.buf, visited.buf, offsets)
+
+def work(chunk):
+    """
+    Expands a chunk of a layer inside a worker process
+    """
+    walls, visited, wall, seen, offsets = _shared
+    return expand(array('q', chunk), wall, seen, offsets)
+
+def expand(chunk, walls, visited, offsets):
+    """
+    Returns every open, unvisited cell one step from the cells of the chunk, as bytes of an array of
+    cells and bytes of an array of the action codes reaching them. Cells are listed in the order a breadth
+    search would generate them: by their first parent in the chunk, then by action code. A cell reached
+    from several cells of the chunk is only listed once.
+
+    :param chunk: Cells of one part of the layer, in layer order
+    :type chunk: array(int, ...)
+    :param walls: Occupancy of each cell, nonzero for walls
+    :type walls: memoryview or bytes
+    :param visited: Nonzero for each cell reached by an earlier layer
+    :type visited: memoryview or bytearray
+    :param offsets: Flat index offset of each action code
+    :type offsets: list(int, ...)
+    """
+    cells = array('q')
+    codes = array('b')
+    found = set()
+    for cell in chunk:
+        for code, offset in enumerate(offsets):
+            next = cell + offset
+            if walls[next] or visited[next] or next in found:
+                continue
+            found.add(next)
+            cells.append(next)
+            codes.append(code)
+    return cells.tobytes(), codes.tobytes()
+
+def level_search(maze, workers=None, chunk=4096):
+    """
+    Conducts a breadth search of the maze one layer at a time, then returns the solution as a tuple of
+    the action list and state list that reaches the goal state: (actions, states), or None if there is
+    no solution.
+
+    The occupancy grid and the visited bitmap are placed in shared memory. Each layer with at least two
+    chunks worth of cells is cut into chunks of contiguous cells that worker processes expand at once,
+    reading the shared grid and bitmap; smaller layers are expanded in this process. The chunks come back
+    in order and are merged here, keeping the first occurrence of each cell, which also fills in the
+    action code leading into each new cell and marks it visited. Since layers keep the order a queue would
+    have, the solution is identical to the one found by Maze.breadth_search.
+
+    If maze.stats holds a Stats, every layer adds its cells as expanded and the cells the expansion
+    returned as generated and, if the stats are timed, the time spent expanding, in workers or here, as
+    expand_time and the time spent merging as frontier_time.
+
+    :param maze: Maze to search
+    :type maze: Maze
+    :param workers: Number of worker processes, defaults to the number of cores; 1 starts none
+    :type workers: int
+    :param chunk: Number of cells of a layer expanded by a worker at a time
+    :type chunk: int
+    """
+    start = maze.index(maze.start)
+    goal = maze.index(maze.goal)
+    if start == goal:
+        return ([], [])
+    offsets = [maze.offsets[action] for action in maze.action_set]
+    """A single worker would only add overhead, and daemonic processes, such as the racers of portfolio.py,
+    cannot start a pool of their own, so both expand every layer here"""
+    alone = workers == 1 or current_process().daemon
+    size = maze.grid.size
+    walls = SharedMemory(create=True, size=size)
+    visited = SharedMemory(create=True, size=size)
+    pool = None
+    try:
+        walls.buf[:size] = maze.grid.tobytes()
+        visited.buf[:size] = bytes(size)
+        wall = walls.buf
+        seen = visited.buf
+        tree = array('b', [-1]) * size
+        seen[start] = 1
+        layer = array('q', [start])
+        stats = maze.stats
+        marked = 1
+        while len(layer):
+            begin = time.perf_counter()
+            if alone or len(layer) < 2 * chunk:
+                results = [expand(layer, wall, seen, offsets)]
+            else:
+                if pool is None:
+                    pool = Pool(workers, initializer=attach, initargs=(walls.name, visited.name, offsets))
+                results = pool.map(work, [layer[i:i + chunk] for i in range(0, len(layer), chunk)])
+            expanded = time.perf_counter()
+            grown = array('q')
+            if stats is not None:
+                if stats.timed:
+                    stats.expand_time += expanded - begin
+                stats.expanded += len(layer)
+                stats.generated += sum(len(codes) for cells, codes in results)
+                stats.touch(len(layer), marked)
+            for cells, codes in results:
+                cells = array('q', cells)
+                codes = array('b', codes)
+                for cell, code in zip(cells, codes):
+                    """Chunks may reach the same cell; the earliest chunk wins, as in a queue"""
+                    if seen[cell]:
+                        continue
+                    seen[cell] = 1
+                    tree[cell] = code
+                    if cell == goal:
+                        return maze.branch(tree, maze.start, maze.goal)
+                    grown.append(cell)
+            if stats is not None and stats.timed:
+                stats.frontier_time += time.perf_counter() - expanded
+            marked += len(grown)
+            layer = grown
+        return None
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        walls.close()
+        walls.unlink()
+        visited.close()
+        visited.unlink()
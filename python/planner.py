@@ -0,0 +1,208 @@
+"""Replans a path through a maze as its walls change"""
+import heapq
+
+INFINITY = float("inf")
+
+class Planner():
+    """
+    The Planner finds a path from the start state to the goal state of a Maze using D* Lite, and repairs
+    that path when cells are toggled between wall and open or when the start state moves, instead of
+    searching again from scratch.
+
+    D* Lite searches backward from the goal. Every cell keeps g, its current steps to the goal, and rhs,
+    the steps to the goal through its best neighbour. A cell whose g and rhs differ is inconsistent and
+    waits in a priority queue. A change to the maze only makes the changed cell and its neighbours
+    inconsistent, so a repair only processes the cells whose steps to the goal actually change, and
+    stops as soon as the path from the start is settled.
+
+    The planner works on its own copy of the occupancy grid, so the Maze it was created from is left
+    unchanged. Cells are flat indices into that grid, as in Maze.index.
+
+    :param maze: Maze to plan through
+    :type maze: Maze
+    :param walls: Occupancy of each cell, 1 for walls, with the wall border of Maze.grid
+    :type walls: bytearray
+    :param g: Steps to the goal of each cell processed so far
+    :type g: dict(int: int)
+    :param rhs: Steps to the goal through the best neighbour of each cell processed so far
+    :type rhs: dict(int: int)
+    :param km: Sum of the heuristic distances the start state has moved, keeping old keys valid
+    :type km: int
+    :param expanded: Number of cells taken from the queue by the last repair
+    :type expanded: int
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.walls = bytearray(maze.grid.tobytes())
+        self.offsets = [maze.offsets[action] for action in maze.action_set]
+        self.start = maze.index(maze.start)
+        self.goal = maze.index(maze.goal)
+        self.last = self.start
+        self.origin = maze.start
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.km = 0
+        self.expanded = 0
+        """Queue entries are (key, count, cell); entries whose key no longer matches queued[cell] are stale"""
+        self._queue = []
+        self._queued = {}
+        self._counter = 0
+        self.push(self.goal)
+
+    def heuristic(self, cell):
+        """
+        Returns the manhatten distance between the start state and the given cell
+        """
+        state = self.maze.decode(cell)
+        diff = 0
+        for s, c in zip(self.origin, state):
+            diff += abs(s - c)
+        return diff
+
+    def key(self, cell):
+        """
+        Returns the priority of the given cell in the queue, lowest first
+        """
+        best = min(self.g.get(cell, INFINITY), self.rhs.get(cell, INFINITY))
+        return (best + self.heuristic(cell) + self.km, best)
+
+    def push(self, cell):
+        """
+        Queue the cell under its current key, making any earlier entry for it stale
+        """
+        key = self.key(cell)
+        self._queued[cell] = key
+        heapq.heappush(self._queue, (key, self._counter, cell))
+        self._counter += 1
+
+    def top(self):
+        """
+        Returns the lowest live key in the queue, dropping stale entries from the top of the heap
+        """
+        while self._queue:
+            key, count, cell = self._queue[0]
+            if self._queued.get(cell) == key:
+                return key
+            heapq.heappop(self._queue)
+        return (INFINITY, INFINITY)
+
+    def neighbours(self, cell):
+        """
+        Returns the open cells one step away from the given cell
+        """
+        if self.walls[cell]:
+            return []
+        return [cell + offset for offset in self.offsets if not self.walls[cell + offset]]
+
+    def update(self, cell):
+        """
+        Recompute rhs of the cell from its neighbours and queue it if it is inconsistent
+        """
+        if cell != self.goal:
+            best = INFINITY
+            for next in self.neighbours(cell):
+                best = min(best, self.g.get(next, INFINITY) + 1)
+            self.rhs[cell] = best
+        self._queued.pop(cell, None)
+        if self.g.get(cell, INFINITY) != self.rhs.get(cell, INFINITY):
+            self.push(cell)
+
+    def compute(self):
+        """
+        Process inconsistent cells in key order until the steps from the start state to the goal are settled
+        """
+        self.expanded = 0
+        while self.top() < self.key(self.start) or self.rhs.get(self.start, INFINITY) != self.g.get(self.start, INFINITY):
+            old, count, cell = heapq.heappop(self._queue)
+            del self._queued[cell]
+            self.expanded += 1
+            new = self.key(cell)
+            g = self.g.get(cell, INFINITY)
+            rhs = self.rhs.get(cell, INFINITY)
+            if old < new:
+                """The key was computed before the start moved; queue it again under its current key"""
+                self._queued[cell] = new
+                heapq.heappush(self._queue, (new, self._counter, cell))
+                self._counter += 1
+            elif g > rhs:
+                """The cell got closer to the goal"""
+                self.g[cell] = rhs
+                for next in self.neighbours(cell):
+                    self.update(next)
+            else:
+                """The cell got farther from the goal; every neighbour that went through it must be redone"""
+                self.g[cell] = INFINITY
+                self.update(cell)
+                for next in self.neighbours(cell):
+                    self.update(next)
+
+    def plan(self):
+        """
+        Repair the plan and return the solution from the start state to the goal state as a tuple of the
+        action list and state list: (actions, states). Returns None if the goal cannot be reached.
+        """
+        self.compute()
+        if self.g.get(self.start, INFINITY) == INFINITY:
+            return None
+        actions = []
+        states = []
+        cell = self.start
+        while cell != self.goal:
+            """Step to the neighbour with the fewest steps to the goal, first in action_set on ties"""
+            best = None
+            for code, offset in enumerate(self.offsets):
+                next = cell + offset
+                if self.walls[next]:
+                    continue
+                steps = self.g.get(next, INFINITY)
+                if best is None or steps < best[0]:
+                    best = (steps, code, next)
+            steps, code, cell = best
+            actions.append(self.maze.action_set[code])
+            states.append(self.maze.decode(cell))
+        return (actions, states)
+
+    def cell(self, state):
+        """
+        Returns the flat index of the given state, which must lie inside the maze
+        """
+        for s, n in zip(state, self.maze.dims):
+            if not 0 <= s < n:
+                raise ValueError("State outside of maze")
+        return self.maze.index(state)
+
+    def toggle(self, state):
+        """
+        Turn the given cell from wall to open or from open to wall, then return the repaired solution.
+        The start and goal states cannot be toggled.
+
+        :param state: Cell to toggle
+        :type state: tuple(int, ...)
+        """
+        cell = self.cell(state)
+        if cell == self.start or cell == self.goal:
+            raise ValueError("Cannot toggle the start or goal state")
+        """Only the cell and the edges to its neighbours change"""
+        self.walls[cell] ^= 1
+        self.update(cell)
+        for offset in self.offsets:
+            if not self.walls[cell + offset]:
+                self.update(cell + offset)
+        return self.plan()
+
+    def move(self, state):
+        """
+        Move the start state to the given open cell, then return the repaired solution
+
+        :param state: New start state
+        :type state: tuple(int, ...)
+        """
+        cell = self.cell(state)
+        if self.walls[cell]:
+            raise ValueError("Cannot move the start state into a wall")
+        self.origin = tuple(state)
+        self.km += self.heuristic(self.last)
+        self.start = cell
+        self.last = cell
+        return self.plan()
@@ -0,0 +1,101 @@
+"""Races several search strategies against each other on one maze"""
+import time
+from multiprocessing import Process, Queue
+from queue import Empty
+
+"""Strategies raced by default; idastar and parallel are left out, being slow on open mazes and already parallel"""
+STRATEGIES = ("breadth", "depth", "greedy", "astar", "random", "bidirectional", "jump")
+
+"""Seconds between checks that the workers are still alive"""
+POLL = 0.1
+
+def compete(maze, strategy, results):
+    """
+    Solves the maze with one strategy inside a worker process and puts (strategy, solution, seconds, error)
+    on the results queue
+    """
+    begin = time.perf_counter()
+    try:
+        solution = maze.solve(strategy=strategy)
+        error = None
+    except Exception as exception:
+        solution = None
+        error = str(exception)
+    results.put((strategy, solution, time.perf_counter() - begin, error))
+
+def race(maze, strategies=STRATEGIES, budget=None):
+    """
+    Runs each strategy on the maze at once, every one in its own process, and returns a tuple of the
+    winning strategy, its solution, and a report: (winner, solution, report).
+
+    Without a budget the first strategy to find a solution wins and the others are cancelled. With a
+    budget, in seconds, the strategies run until all of them finish or the budget runs out, and the
+    shortest solution found wins, ties going to the strategy that finished first; if none has found a
+    solution when the budget runs out, the first to find one afterwards wins. The winner and solution
+    are None if no strategy finds a solution.
+
+    The report maps each strategy to a dict of how long it ran, in seconds, whether it finished or was
+    cancelled, the steps in its solution, and its error if it failed. A worker that dies without putting
+    a result, e.g. one killed by the system, counts as failed.
+
+    :param maze: Maze to solve
+    :type maze: Maze
+    :param strategies: Keys of Maze.strategies to race
+    :type strategies: list(str, ...)
+    :param budget: Seconds from the start of the race, worker startup included, to wait for a shorter solution
+    :type budget: float
+    """
+    for strategy in strategies:
+        if strategy not in maze.strategies:
+            raise ValueError(f"strategy must be one of {', '.join(maze.strategies)}")
+    """Built once here so that workers started by fork inherit it; pickled copies of the maze rebuild it"""
+    maze.adjacency()
+    results = Queue()
+    workers = {}
+    report = {}
+    begin = time.perf_counter()
+    for strategy in strategies:
+        worker = Process(target=compete, args=(maze, strategy, results), daemon=True)
+        worker.start()
+        workers[strategy] = worker
+    deadline = None if budget is None else begin + budget
+    best = None
+    exited = set()
+    try:
+        while len(report) < len(workers):
+            now = time.perf_counter()
+            if best is not None and (deadline is None or now >= deadline):
+                break
+            wait = POLL if best is None or deadline is None else min(POLL, deadline - now)
+            try:
+                strategy, solution, seconds, error = results.get(timeout=max(wait, 0))
+            except Empty:
+                """
+                A worker puts its result before it exits, so one seen to have exited on two polls in a row
+                without a result died, killed or crashed, and is recorded as failed
+                """
+                for strategy in exited:
+                    if strategy not in report:
+                        report[strategy] = {"seconds": time.perf_counter() - begin, "finished": True, "steps": None,
+                                            "error": f"exited with code {workers[strategy].exitcode} without a result"}
+                exited = {strategy for strategy, worker in workers.items()
+                          if strategy not in report and not worker.is_alive()}
+                continue
+            report[strategy] = {"seconds": seconds, "finished": True,
+                                "steps": None if solution is None else len(solution[0])}
+            if error is not None:
+                report[strategy]["error"] = error
+            if solution is not None and (best is None or len(solution[0]) < len(best[1][0])):
+                best = (strategy, solution)
+    finally:
+        """Cancel every strategy still running"""
+        for strategy, worker in workers.items():
+            if strategy not in report:
+                worker.terminate()
+                report[strategy] = {"seconds": time.perf_counter() - begin, "finished": False, "steps": None}
+        for worker in workers.values():
+            worker.join()
+    report = {strategy: report[strategy] for strategy in strategies}
+    if best is None:
+        return (None, None, report)
+    return (best[0], best[1], report)
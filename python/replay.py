@@ -0,0 +1,94 @@
+"""Replays a solution through a maze without rendering the whole maze at every step"""
+
+class Replay():
+    """
+    Replay renders the maze once with Maze.print and keeps the result as a mutable list of characters,
+    the frame. Each step then restores the characters of the previous state from the base rendering and
+    writes the state_char over those of the current state, so a step costs big * big characters instead
+    of a render of every cell. The frame after each step is exactly what Maze.print_state returns for the
+    same state.
+
+    The characters of a cell are found arithmetically from the layout of Maze.render: every row of the
+    maze is big lines of dims[-1] * big characters and a sep_char, and after the rows closing a block
+    along k dimensions come k more sep_chars, each making an empty line.
+
+    For terminals, step_ansi returns only the escape sequences that move the cursor to the changed
+    characters and rewrite them, to be written after the frame has been printed once. Only the lines
+    that fit on the screen can be reached this way.
+
+    :param maze: Maze the solution runs through
+    :type maze: Maze
+    :param big: Big factor used to determine maze magnification
+    :type big: int
+    :param frame: Current rendering
+    :type frame: list(str, ...)
+    """
+
+    def __init__(self, maze, big=1):
+        self.maze = maze
+        self.big = big
+        self.base = maze.print(big)
+        self.frame = list(self.base)
+        self.lines = self.base.count(maze.sep_char)
+        self.length = maze.dims[-1] * big + 1
+        """Rows in each block along the last k dimensions, for k from 1 to dimensions - 2"""
+        self.blocks = []
+        size = 1
+        for n in reversed(maze.dims[1:-1]):
+            size *= n
+            self.blocks.append(size)
+        self.state = None
+
+    def cells(self, state):
+        """
+        Returns (line, column, position) of every character of the given state, position being its index
+        into the frame
+        """
+        row = 0
+        for s, n in zip(state[:-1], self.maze.dims[:-1]):
+            row = row * n + s
+        """Each block separator before the row is one sep_char, making one empty line"""
+        empty = sum(row // size for size in self.blocks)
+        line = row * self.big + empty
+        first = row * self.big * self.length + empty
+        column = state[-1] * self.big
+        found = []
+        for j in range(self.big):
+            for i in range(self.big):
+                found.append((line + j, column + i, first + j * self.length + column + i))
+        return found
+
+    def patch(self, state):
+        """
+        Move the current state to the given state, returning the (line, column, character) changed
+        """
+        changes = []
+        if self.state is not None:
+            for line, column, position in self.cells(self.state):
+                self.frame[position] = self.base[position]
+                changes.append((line, column, self.base[position]))
+        self.state = None if state is None else tuple(state)
+        """The start and goal characters are drawn over the state, as in Maze.print_state"""
+        if self.state is not None and self.state not in (self.maze.start, self.maze.goal):
+            for line, column, position in self.cells(self.state):
+                self.frame[position] = self.maze.state_char
+                changes.append((line, column, self.maze.state_char))
+        return changes
+
+    def step(self, state):
+        """
+        Move the current state to the given state and return the whole frame, as Maze.print_state would
+        """
+        self.patch(state)
+        return "".join(self.frame)
+
+    def step_ansi(self, state):
+        """
+        Move the current state to the given state and return the ANSI escape sequences that update a copy
+        of the frame printed just above the cursor, leaving the cursor where it started
+        """
+        out = []
+        for line, column, char in self.patch(state):
+            up = self.lines - line
+            out.append(f"\x1b[{up}A\x1b[{column + 1}G{char}\x1b[{up}B\r")
+        return "".join(out)
@@ -0,0 +1,173 @@
+"""Counters and timings describing the cost of a search"""
+import json
+import time
+import functools
+
+class Stats():
+    """
+    Stats records what one search of a Maze cost. Each search method assigns a new Stats to maze.stats
+    when it starts, so the stats of a search are never mixed with those of another, including searches
+    run by Maze.solve on shallow copies of the maze.
+
+    Counters are always kept, being cheap. The split of the search time between expanding and the
+    frontier needs a clock reading around every operation, which slows the search, so it is only
+    measured if the stats are timed, i.e., if Maze.profile is set; otherwise both times stay zero.
+
+    :param strategy: Name of the search method
+    :type strategy: string
+    :param timed: Whether expand_time and frontier_time are measured
+    :type timed: bool
+    :param generated: Number of successor states produced while expanding
+    :type generated: int
+    :param expanded: Number of states expanded
+    :type expanded: int
+    :param pushed: Number of entries added to the frontier
+    :type pushed: int
+    :param duplicates: Number of entries added to the frontier for a state it already held
+    :type duplicates: int
+    :param frontier: Largest number of states in the frontier at once
+    :type frontier: int
+    :param explored: Largest number of states marked explored, or kept on the path by ida_star_search
+    :type explored: int
+    :param expand_time: Seconds spent producing successor states
+    :type expand_time: float
+    :param frontier_time: Seconds spent adding to and removing from the frontier
+    :type frontier_time: float
+    :param load: Seconds spent reading the maze file
+    :type load: float
+    :param build: Seconds spent building the occupancy grid and actions
+    :type build: float
+    :param adjacency: Seconds spent building the adjacency, if it has been built
+    :type adjacency: float
+    :param search: Seconds of wall-clock time spent in the search method
+    :type search: float
+    """
+
+    fields = ("strategy", "generated", "expanded", "pushed", "duplicates", "frontier", "explored",
+              "expand_time", "frontier_time", "load", "build", "adjacency", "search")
+
+    def __init__(self, strategy=None, timings=None, timed=False):
+        timings = timings or {}
+        self.strategy = strategy
+        self.timed = timed
+        self.generated = 0
+        self.expanded = 0
+        self.pushed = 0
+        self.duplicates = 0
+        self.frontier = 0
+        self.explored = 0
+        self.expand_time = 0.0
+        self.frontier_time = 0.0
+        self.load = timings.get("load")
+        self.build = timings.get("build")
+        self.adjacency = timings.get("adjacency")
+        self.search = None
+        self._frontiers = []
+        self._bitmaps = []
+
+    def __str__(self):
+        s = ""
+        for field in self.fields:
+            value = getattr(self, field)
+            if isinstance(value, float):
+                value = f"{value:.6f}s"
+            s += f"{field + ':':15}{value}\n"
+        return s
+
+    def as_dict(self):
+        """
+        Returns the stats as a dict of field: value
+        """
+        return {field: getattr(self, field) for field in self.fields}
+
+    def to_json(self):
+        """
+        Returns the stats as a JSON object
+        """
+        return json.dumps(self.as_dict())
+
+    def watch(self, frontier):
+        """
+        Returns the frontier, whose counters are read into these stats once the search ends. If the
+        stats are timed, the frontier is wrapped so that adding and removing are also timed.
+        """
+        self._frontiers.append(frontier)
+        if self.timed:
+            return Watched(frontier, self)
+        return frontier
+
+    def track(self, explored):
+        """
+        Returns the given explored bitmap, kept so that its marks are counted once the search ends
+        """
+        self._bitmaps.append(explored)
+        return explored
+
+    def finish(self):
+        """
+        Read the counters of the watched frontiers, and count the marks of the tracked explored bitmaps,
+        which only ever grow, into the peak explored size
+        """
+        for frontier in self._frontiers:
+            self.pushed += frontier.pushed
+            self.duplicates += frontier.duplicates
+            self.touch(frontier.peak, 0)
+        for bitmap in self._bitmaps:
+            self.touch(0, bitmap.count(1))
+        self._frontiers = []
+        self._bitmaps = []
+
+    def touch(self, frontier, explored):
+        """
+        Raise the peak frontier and explored sizes to the given sizes if larger
+        """
+        if frontier > self.frontier:
+            self.frontier = frontier
+        if explored > self.explored:
+            self.explored = explored
+
+class Watched():
+    """
+    Watched passes every call through to a frontier, timing add and remove into Stats.frontier_time
+
+    :param frontier: Frontier to watch
+    :type frontier: Frontier
+    :param stats: Stats to record into
+    :type stats: Stats
+    """
+
+    def __init__(self, frontier, stats):
+        self._watched = frontier
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self._watched, name)
+
+    def add(self, node):
+        begin = time.perf_counter()
+        self._watched.add(node)
+        self._stats.frontier_time += time.perf_counter() - begin
+
+    def remove(self, *args):
+        begin = time.perf_counter()
+        node = self._watched.remove(*args)
+        self._stats.frontier_time += time.perf_counter() - begin
+        return node
+
+def measured(search):
+    """
+    Decorates a search method of Maze so that it starts on a new Stats in maze.stats, named after the
+    method and timed if maze.profile is set, and records the wall-clock time of the whole call in it
+    """
+    @functools.wraps(search)
+    def wrapper(self, *args, **kwargs):
+        stats = Stats(search.__name__, self.timings, self.profile)
+        self.stats = stats
+        begin = time.perf_counter()
+        try:
+            return search(self, *args, **kwargs)
+        finally:
+            stats.search = time.perf_counter() - begin
+            stats.adjacency = self.timings.get("adjacency")
+            stats.finish()
+    return wrapper